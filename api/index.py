@@ -15,3 +15,9 @@ django.setup()
 
 # Vercel looks for "app"
 app = get_wsgi_application()
+
+# Resolve the URLconf during the init phase so every app's urls, views and
+# serializers are imported before the first request rather than during it.
+from django.urls import get_resolver
+get_resolver().url_patterns
+
@@ -3,10 +3,14 @@
 from pathlib import Path
 from datetime import timedelta
 import os
-import dj_database_url
-from decouple import config
+from decouple import Config, RepositoryEmpty, config
 from corsheaders.defaults import default_headers
 
+if os.environ.get("VERCEL"):
+    # Vercel injects every setting as a real env var, so skip AutoConfig's
+    # upward walk looking for a .env/settings.ini on each cold start.
+    config = Config(RepositoryEmpty())
+
 # -----------------------------------------------------------------------------
 # Paths
 # -----------------------------------------------------------------------------
@@ -103,11 +107,21 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "abacus_project.wsgi.application"
 
+# Tests need Postgres (array and full-text columns); see the runner for schema setup.
+TEST_RUNNER = "abacus_project.test_runner.AbacusTestRunner"
+
 # -----------------------------------------------------------------------------
 # Database
 #   - Falls back to SQLite locally if DATABASE_URL isn't set
-#   - Uses pooled (pgBouncer) URL on Vercel with sslmode=require
+#   - Uses pooled (pgBouncer) URL on Vercel with sslmode=require, e.g.
+#       DATABASE_URL=postgresql://user:pw@pooler-host:6432/db
+#     The pooler runs in transaction mode, so server-side cursors are
+#     disabled there and ATOMIC_REQUESTS stays off.
 #   - conn_max_age=0 on Vercel to avoid lingering serverless connections
+#   - Postgres elsewhere uses psycopg 3's built-in pool (Django 5.1+);
+#     other engines keep health-checked persistent connections
+#   - dj_database_url is only imported when a URL is configured, keeping it
+#     off the cold-start path for SQLite-only runs
 # -----------------------------------------------------------------------------
 DATABASES = {
     "default": {
@@ -118,12 +132,44 @@ DATABASES = {
 
 database_url = config("DATABASE_URL", default=None)
 if database_url:
-    conn_age = 0 if os.environ.get("VERCEL") else 600
+    import dj_database_url
+
+    on_vercel = bool(os.environ.get("VERCEL"))
+    use_pool = not on_vercel and database_url.startswith(("postgres://", "postgresql://"))
+    # Django's pool manages connection reuse itself and rejects CONN_MAX_AGE
+    conn_age = 0 if on_vercel or use_pool else 600
     DATABASES["default"] = dj_database_url.config(
         default=database_url,
         conn_max_age=conn_age,
+        conn_health_checks=conn_age > 0,
+        disable_server_side_cursors=on_vercel,
         ssl_require=True,
     )
+    if use_pool:
+        DATABASES["default"]["OPTIONS"]["pool"] = True
+
+# -----------------------------------------------------------------------------
+# Cache
+#   - Only Redis (REDIS_URL) is used: it is shared by every instance, so an
+#     invalidation made by one worker is seen by all of them, and a lookup
+#     is cheaper than the query it replaces
+#   - Without it nothing is cached; a per-process cache would go stale on
+#     other instances and a database cache saves no round trip
+# -----------------------------------------------------------------------------
+redis_url = config("REDIS_URL", default=None)
+if redis_url:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": redis_url,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.dummy.DummyCache",
+        }
+    }
 
 # -----------------------------------------------------------------------------
 # Passwords
@@ -154,6 +200,10 @@ USE_TZ = True
 # Static files (WhiteNoise)
 #   - collectstatic will place files under ../staticfiles at deploy
 #   - all traffic routed through Django; WhiteNoise serves /static/*
+#   - collectstatic writes .br alongside .gz (whitenoise[brotli] extra)
+#   - hashed manifest files already get a far-future max-age; the global
+#     WHITENOISE_MAX_AGE stays default because some URLs (codex category
+#     covers) reference unhashed /static/ paths directly
 # -----------------------------------------------------------------------------
 TEMPLATES[0]["DIRS"] = [BASE_DIR / "templates"]  # BASE_DIR == backend/
 STATIC_URL = "/static/"
@@ -174,8 +224,9 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
-        # enable browsable API auth in dev if needed
-        "rest_framework.authentication.SessionAuthentication",
+    ) + (
+        # browsable API auth in dev only; keeps session/CSRF work off the JWT path
+        ("rest_framework.authentication.SessionAuthentication",) if DEBUG else ()
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
@@ -0,0 +1,51 @@
+import importlib
+
+from django.conf import settings
+from django.db import connections
+from django.db.models.signals import post_migrate, pre_migrate
+from django.test.runner import DiscoverRunner
+
+# Raw SQL the model-built schema lacks, keyed by the migration that ships it.
+SCHEMA_SQL_MIGRATIONS = [
+    ('index.migrations.0013_indexprofile_search_trigger', 'CREATE_TRIGGER_SQL'),
+]
+
+
+def _create_extensions(using, **kwargs):
+    connection = connections[using]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+
+def _install_schema_sql(using, app_config, **kwargs):
+    # post_migrate fires once per app; install the SQL after the index app's tables exist.
+    connection = connections[using]
+    if connection.vendor != 'postgresql' or app_config.label != 'index':
+        return
+    with connection.cursor() as cursor:
+        for module_name, attr in SCHEMA_SQL_MIGRATIONS:
+            for statement in getattr(importlib.import_module(module_name), attr):
+                cursor.execute(statement)
+
+
+class AbacusTestRunner(DiscoverRunner):
+    """Builds the test schema straight from the models.
+
+    The historical index/scales migrations reference each other's models in a
+    cycle that cannot be replayed on an empty database, so the test database
+    is synced from the current models instead. The extension and triggers
+    that only migrations create are added around that sync.
+    """
+
+    def setup_databases(self, **kwargs):
+        for alias in connections:
+            settings.DATABASES[alias].setdefault('TEST', {})['MIGRATE'] = False
+        pre_migrate.connect(_create_extensions)
+        post_migrate.connect(_install_schema_sql)
+        try:
+            old_config = super().setup_databases(**kwargs)
+        finally:
+            pre_migrate.disconnect(_create_extensions)
+            post_migrate.disconnect(_install_schema_sql)
+        return old_config
@@ -1,22 +1,26 @@
 from django.contrib import admin
 from django.urls import path, include
 from django.views.generic import TemplateView
-from django.http import JsonResponse
+from django.http import HttpResponse
+import json
 
 # Custom JWT View
 from users.views import MyTokenObtainPairView
 from rest_framework_simplejwt.views import TokenRefreshView
 
+# The index never changes, so encode it once instead of on every hit.
+_API_ROOT_BODY = json.dumps({
+    "lineage": "/api/lineage/",
+    "scales": "/api/scales/",
+    "codex": "/api/codex/",
+    "loom": "/api/loom/",
+    "index": "/api/index/",
+    "audit": "/api/audit/",
+    "users": "/api/users/",
+}).encode()
+
 def api_root(_request):
-    return JsonResponse({
-        "lineage": "/api/lineage/",
-        "scales": "/api/scales/",
-        "codex": "/api/codex/",
-        "loom": "/api/loom/",
-        "index": "/api/index/",
-        "audit": "/api/audit/",
-        "users": "/api/users/",
-    })
+    return HttpResponse(_API_ROOT_BODY, content_type='application/json')
 
 urlpatterns = [
     # ✅ point to the template that actually exists in the index app
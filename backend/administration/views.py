@@ -1,11 +1,15 @@
 from django.shortcuts import render
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework.response import Response
 from api.permissions import IsProtector
 from django.contrib.auth.models import User
 from users.models import UserProfile
 
 @api_view(['GET'])
+# Rendered page reached by browser navigation, so it keeps session auth in production
+@authentication_classes([JWTAuthentication, SessionAuthentication])
 @permission_classes([IsProtector])
 def administration_panel(request):
     heirs = User.objects.filter(profile__role='HEIR')
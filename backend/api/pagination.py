@@ -0,0 +1,13 @@
+from rest_framework.pagination import CursorPagination
+
+
+class OptInCursorPagination(CursorPagination):
+    """Cursor pagination that only applies when the client sends ?page_size=.
+
+    Existing callers keep receiving a plain JSON array; clients that opt in get
+    a bounded page plus next/previous cursors. Cursor pagination avoids OFFSET
+    scans, so deep pages cost the same as the first one.
+    """
+    page_size = None
+    page_size_query_param = 'page_size'
+    max_page_size = 200
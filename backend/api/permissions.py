@@ -3,9 +3,27 @@ from django.utils import timezone
 from django.core.exceptions import ObjectDoesNotExist
 
 def get_user_role(user):
-    """Safely retrieve the user's role from their profile."""
+    """Safely retrieve the user's role from their profile.
+
+    The result is memoized on the user instance, which DRF builds fresh for
+    each request, so repeated permission checks within a request are free.
+    Saving the user's profile or mantle clears it (see clear_cached_role).
+    """
     if not user.is_authenticated:
         return None
+    try:
+        return user._cached_role
+    except AttributeError:
+        pass
+    role = _resolve_user_role(user)
+    user._cached_role = role
+    return role
+
+def clear_cached_role(user):
+    """Forget the role get_user_role memoized, after the profile or mantle behind it changes."""
+    user.__dict__.pop('_cached_role', None)
+
+def _resolve_user_role(user):
     try:
         base_role = user.profile.role
         # Check for Protector's Mantle
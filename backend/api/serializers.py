@@ -0,0 +1,34 @@
+class SparseFieldsetMixin:
+    """Lets GET callers trim a ModelSerializer's output with ?fields=a,b,c.
+
+    Names that are not in Meta.fields are ignored, and a request that selects
+    nothing valid falls back to the full representation. Views pass their
+    queryset through sparse_queryset() so deferred columns are not fetched.
+    """
+    fields_query_param = 'fields'
+
+    @classmethod
+    def requested_fields(cls, request):
+        if request is None or request.method != 'GET':
+            return None
+        raw = request.query_params.get(cls.fields_query_param)
+        if not raw:
+            return None
+        wanted = {name.strip() for name in raw.split(',')}
+        return [name for name in cls.Meta.fields if name in wanted] or None
+
+    @classmethod
+    def sparse_queryset(cls, queryset, request):
+        selected = cls.requested_fields(request)
+        if not selected:
+            return queryset
+        columns = {field.name for field in queryset.model._meta.concrete_fields}
+        pk_name = queryset.model._meta.pk.name
+        return queryset.only(pk_name, *[name for name in selected if name in columns])
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = self.requested_fields(self.context.get('request'))
+        if selected:
+            for name in set(self.fields) - set(selected):
+                self.fields.pop(name)
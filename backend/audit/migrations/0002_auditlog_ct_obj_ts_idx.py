@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-15 07:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['content_type', 'object_id', '-timestamp'], name='auditlog_ct_obj_ts_idx'),
+        ),
+    ]
@@ -29,6 +29,10 @@ class AuditLog(models.Model):
 
     class Meta:
         ordering = ['-timestamp'] # Show newest entries first
+        indexes = [
+            # Serves per-object history lookups such as the faction timeline.
+            models.Index(fields=['content_type', 'object_id', '-timestamp'], name='auditlog_ct_obj_ts_idx'),
+        ]
 
     def __str__(self):
         return f'[{self.timestamp.strftime("%Y-%m-%d %H:%M:%S")}] [{self.role}] {self.action}'
@@ -4,17 +4,9 @@ from .models import AuditLog
 from users.models import Mantle
 from django.utils import timezone
 
-def log_action(user, action: str, target: models.Model = None, details: dict = None):
-    """
-    A centralized utility for creating audit log entries.
-
-    :param user: The user performing the action.
-    :param action: A string describing the action (e.g., 'Created agent Spectre').
-    :param target: The model instance being acted upon (optional).
-    :param details: A dictionary for storing extra context (optional).
-    """
+def _effective_role(user):
+    """The user's role as recorded in the audit trail, considering an active Mantle."""
     try:
-        # Determine effective role, considering active Mantle
         role = user.profile.role
         if role == 'HEIR':
             try:
@@ -25,11 +17,35 @@ def log_action(user, action: str, target: models.Model = None, details: dict = N
                 pass
     except AttributeError:
         role = 'ANONYMOUS'  # Should not happen for authenticated users
+    return role
+
+def log_action(user, action: str, target: models.Model = None, details: dict = None):
+    """
+    A centralized utility for creating audit log entries.
 
+    :param user: The user performing the action.
+    :param action: A string describing the action (e.g., 'Created agent Spectre').
+    :param target: The model instance being acted upon (optional).
+    :param details: A dictionary for storing extra context (optional).
+    """
     AuditLog.objects.create(
         user=user,
-        role=role,
+        role=_effective_role(user),
         action=action,
         content_object=target,
         details=details
     )
+
+def log_actions_bulk(user, entries):
+    """
+    Record several audit entries for one request with a single INSERT.
+
+    :param user: The user performing the actions.
+    :param entries: An iterable of (action, target, details) tuples; target and
+                    details may be None, as with log_action.
+    """
+    role = _effective_role(user)
+    AuditLog.objects.bulk_create([
+        AuditLog(user=user, role=role, action=action, content_object=target, details=details)
+        for action, target, details in entries
+    ])
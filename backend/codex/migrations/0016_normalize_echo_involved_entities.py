@@ -0,0 +1,34 @@
+from django.db import migrations
+
+
+def forwards(apps, schema_editor):
+    Echo = apps.get_model('codex', 'Echo')
+    # Apply the write-time normalization from EchoSerializer to existing rows
+    for echo in Echo.objects.filter(involved_entities__isnull=False).only('id', 'involved_entities').iterator():
+        entities = echo.involved_entities
+        if not isinstance(entities, list):
+            continue
+        normalized = [
+            {**entity, 'id': str(entity['id'])}
+            for entity in entities
+            if isinstance(entity, dict) and {'id', 'type', 'name'} <= entity.keys()
+        ]
+        if normalized != entities:
+            echo.involved_entities = normalized
+            echo.save(update_fields=['involved_entities'])
+
+
+def backwards(apps, schema_editor):
+    # No-op backwards; normalized data remains valid
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('codex', '0015_alter_notification_notif_type'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
@@ -22,19 +22,16 @@ class EchoSerializer(serializers.ModelSerializer):
         fields = ['id', 'title', 'content', 'suggested_target', 'confidence', 'involved_entities', 'evidence_urls', 'status', 'created_by', 'decided_by', 'decided_by_username', 'created_at', 'decided_at']
         read_only_fields = ['status', 'created_by', 'decided_by', 'decided_by_username', 'created_at', 'decided_at']
 
-    def to_representation(self, instance):
-        """Ensure involved_entities has a consistent structure for the frontend."""
-        ret = super().to_representation(instance)
-        entities = ret.get('involved_entities', [])
-        if isinstance(entities, list):
-            normalized_entities = []
-            for entity in entities:
-                if isinstance(entity, dict) and 'id' in entity and 'type' in entity and 'name' in entity:
-                    # Ensure ID is a string for consistency, as it comes from the form.
-                    entity['id'] = str(entity['id'])
-                    normalized_entities.append(entity)
-            ret['involved_entities'] = normalized_entities
-        return ret
+    def validate_involved_entities(self, value):
+        """Normalize involved_entities on write so reads can return the stored JSON as-is."""
+        if not isinstance(value, list):
+            return value
+        # Ensure ID is a string for consistency, as it comes from the form.
+        return [
+            {**entity, 'id': str(entity['id'])}
+            for entity in value
+            if isinstance(entity, dict) and {'id', 'type', 'name'} <= entity.keys()
+        ]
 
 class TaskSerializer(serializers.ModelSerializer):
     created_by_username = serializers.CharField(source='created_by.username', read_only=True)
@@ -89,16 +86,26 @@ class BulletinSerializer(serializers.ModelSerializer):
         user = self.context.get('request').user if self.context.get('request') else None
         if not user or not user.is_authenticated:
             return False
-        return obj.acks.filter(user=user).exists()
+        # Reads from the prefetched acks when the view supplies them.
+        return any(ack.user_id == user.id for ack in obj.acks.all())
 
     def get_acknowledged_by(self, obj):
         # Return a list of usernames of all users who have acknowledged the bulletin.
-        return [ack.user.username for ack in obj.acks.select_related('user').all()]
+        # list/retrieve prefetch the acks with their users; other actions join them here.
+        acks = obj.acks.all()
+        if 'acks' not in getattr(obj, '_prefetched_objects_cache', {}):
+            acks = acks.select_related('user')
+        return [ack.user.username for ack in acks]
 
     def get_total_users(self, obj):
-        from django.contrib.auth.models import User
         # We count all active users as the potential audience for any bulletin.
-        return User.objects.filter(is_active=True).count()
+        # Cached in the context, which a list's child serializers share, so a
+        # response counts once however many bulletins it holds.
+        total = self.context.get('total_users')
+        if total is None:
+            total = User.objects.filter(is_active=True).count()
+            self.context['total_users'] = total
+        return total
 
 class NotificationSerializer(serializers.ModelSerializer):
     class Meta:
@@ -0,0 +1,54 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from .models import Bulletin, BulletinAck, Notification
+
+
+class BulletinAPITests(APITestCase):
+    def setUp(self):
+        self.author = User.objects.create_user('author', password='pw')
+        self.readers = [User.objects.create_user(f'reader{i}', password='pw') for i in range(3)]
+        self.client.force_authenticate(self.author)
+        self.bulletin = Bulletin.objects.create(title='Curfew', message='Stay in.', created_by=self.author)
+
+    def bulletin_url(self, suffix=''):
+        return f'/api/codex/bulletins/{self.bulletin.id}/{suffix}'
+
+    def ack_as(self, *users):
+        for user in users:
+            BulletinAck.objects.create(bulletin=self.bulletin, user=user)
+
+    def patch_ack_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(self.bulletin_url(), {'title': 'Curfew extended'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        return response, [q['sql'] for q in queries.captured_queries if 'auth_user' in q['sql'] or 'codex_bulletinack' in q['sql']]
+
+    def test_list_reports_who_acknowledged(self):
+        self.ack_as(*self.readers[:2])
+        response = self.client.get('/api/codex/bulletins/')
+        self.assertEqual(response.status_code, 200)
+        [bulletin] = response.data
+        self.assertCountEqual(bulletin['acknowledged_by'], ['reader0', 'reader1'])
+        self.assertFalse(bulletin['acknowledged'])
+        self.assertEqual(bulletin['total_users'], 4)
+
+    def test_update_reads_ack_usernames_without_a_query_per_ack(self):
+        self.ack_as(self.readers[0])
+        _, one_ack = self.patch_ack_queries()
+        self.ack_as(*self.readers[1:])
+        response, three_acks = self.patch_ack_queries()
+        self.assertEqual(len(three_acks), len(one_ack))
+        self.assertCountEqual(response.data['acknowledged_by'], ['reader0', 'reader1', 'reader2'])
+
+    def test_first_acknowledgement_notifies_the_author_once(self):
+        self.client.force_authenticate(self.readers[0])
+        for _ in range(2):
+            response = self.client.post(self.bulletin_url('ack/'))
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(BulletinAck.objects.filter(bulletin=self.bulletin).count(), 1)
+        self.assertEqual(
+            Notification.objects.filter(user=self.author, notif_type=Notification.Type.BULLETIN_ACK).count(), 1,
+        )
@@ -8,8 +8,11 @@ from lineage.models import Agent as LineageAgent
 from .serializers import CodexEntrySerializer, EchoSerializer, TaskSerializer, SiloCommentSerializer, PropertyDossierSerializer, VehicleSerializer, BulletinSerializer, NotificationSerializer
 from api.permissions import IsProtector, IsProtectorOrHeir, get_user_role, IsTrueProtector, IsHQ
 from audit.utils import log_action
+from users.models import leadership_user_ids
+from django.conf import settings
 from django.contrib.auth.models import User
-from django.db.models import Q
+from django.db.models import Q, Prefetch
+from django.utils import timezone
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -117,7 +120,6 @@ class CodexEntryViewSet(viewsets.ModelViewSet):
             qs = qs.filter(entry_type=category)
         q = self.request.query_params.get('search')
         if q:
-            from django.db.models import Q
             qs = qs.filter(Q(title__icontains=q) | Q(content__icontains=q))
         return qs
 
@@ -148,20 +150,19 @@ class EchoViewSet(viewsets.ModelViewSet):
         log_action(self.request.user, f"Submitted echo '{echo.title}' targeting {echo.suggested_target}", target=echo)
         # Notify leadership about new Silo report
         try:
-            recipients = User.objects.filter(profile__role__in=['PROTECTOR', 'HEIR']).distinct()
             Notification.objects.bulk_create([
                 Notification(
-                    user=u,
+                    user_id=user_id,
                     notif_type=Notification.Type.SILO_REPORT,
                     message=f"New Silo report: {echo.title}",
                     metadata={'echo_id': echo.id}
-                ) for u in recipients
+                ) for user_id in leadership_user_ids()
             ])
         except Exception:
             pass
 
     def get_queryset(self):
-        qs = super().get_queryset().select_related('created_by').prefetch_related('assigned_agents')
+        qs = super().get_queryset().select_related('created_by__profile', 'decided_by').prefetch_related('assigned_agents')
         
         # Handle single status filter
         status_filter = self.request.query_params.get('status')
@@ -240,7 +241,7 @@ class EchoViewSet(viewsets.ModelViewSet):
         if echo.status == Echo.Status.DISMISSED:
             return Response({'error': 'Cannot comment on a dismissed report.'}, status=status.HTTP_400_BAD_REQUEST)
         if request.method.lower() == 'get':
-            return Response(SiloCommentSerializer(echo.comments.select_related('user'), many=True).data)
+            return Response(SiloCommentSerializer(echo.comments.select_related('user__profile'), many=True).data)
         # POST add comment
         msg = request.data.get('message')
         if not msg:
@@ -397,6 +398,11 @@ class BulletinViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         qs = super().get_queryset()
         # Bulletins are for all authenticated users.
+        if self.action in ('list', 'retrieve'):
+            # Only list/retrieve serialize the acks; fetch just the ack owner id and username.
+            qs = qs.prefetch_related(
+                Prefetch('acks', queryset=BulletinAck.objects.select_related('user').only('bulletin_id', 'user_id', 'user__username'))
+            )
         return qs
 
     def perform_create(self, serializer):
@@ -466,7 +472,6 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
         ids = request.data.get('ids') or []
         if not isinstance(ids, list):
             return Response({'error': 'ids must be a list'}, status=status.HTTP_400_BAD_REQUEST)
-        from django.utils import timezone
         Notification.objects.filter(user=request.user, id__in=ids, read_at__isnull=True).update(read_at=timezone.now())
         return Response({'status': 'ok'})
 
@@ -503,7 +508,6 @@ class VaultAccessMixin:
         # Require secondary auth for Heir only; Protector and HQ bypass
         if role not in ['PROTECTOR', 'HQ']:
             secondary = request.headers.get('X-Secondary-Auth') or request.data.get('secondary_auth') or request.query_params.get('secondary_auth')
-            from django.conf import settings
             if secondary != settings.SECONDARY_PASSPHRASE:
                 return Response({'error': 'Secondary authentication required'}, status=status.HTTP_403_FORBIDDEN)
         return None
@@ -624,7 +628,6 @@ class VaultItemViewSet(viewsets.ModelViewSet):
         # Secondary authentication is required unless effective role is Protector or HQ
         if role not in ['PROTECTOR', 'HQ']:
             secondary = request.headers.get('X-Secondary-Auth') or request.query_params.get('secondary_auth')
-            from django.conf import settings
             if secondary != settings.SECONDARY_PASSPHRASE:
                 return Response({'error': 'Secondary authentication required'}, status=status.HTTP_403_FORBIDDEN)
         return super().list(request, *args, **kwargs)
@@ -635,7 +638,6 @@ class VaultItemViewSet(viewsets.ModelViewSet):
             return Response({'error': 'Forbidden'}, status=status.HTTP_403_FORBIDDEN)
         if role not in ['PROTECTOR', 'HQ']:
             secondary = request.headers.get('X-Secondary-Auth') or request.data.get('secondary_auth')
-            from django.conf import settings
             if secondary != settings.SECONDARY_PASSPHRASE:
                 return Response({'error': 'Secondary authentication required'}, status=status.HTTP_403_FORBIDDEN)
         return super().create(request, *args, **kwargs)
@@ -651,7 +653,6 @@ class VaultItemViewSet(viewsets.ModelViewSet):
             return Response({'error': 'Forbidden'}, status=status.HTTP_403_FORBIDDEN)
         if role not in ['PROTECTOR', 'HQ']:
             secondary = request.headers.get('X-Secondary-Auth') or request.data.get('secondary_auth') or request.query_params.get('secondary_auth')
-            from django.conf import settings
             if secondary != settings.SECONDARY_PASSPHRASE:
                 return Response({'error': 'Secondary authentication required'}, status=status.HTTP_403_FORBIDDEN)
         return None
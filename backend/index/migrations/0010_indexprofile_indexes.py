@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-15 06:48
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('index', '0009_indexconnection_delete_profileconnection_and_more'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='indexprofile',
+            index=models.Index(fields=['full_name'], name='index_index_full_na_78a46f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='indexprofile',
+            index=models.Index(fields=['classification'], name='index_index_classif_c50f9e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='indexprofile',
+            index=models.Index(fields=['status'], name='index_index_status_fe0f78_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='indexprofile',
+            index=models.Index(fields=['threat_level'], name='index_index_threat__c1b39f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='indexprofile',
+            index=models.Index(fields=['deleted_at'], name='index_index_deleted_fdfe88_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='indexprofile',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('full_name'), name='gin_trgm_ops'), name='indexprofile_name_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='indexprofile',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('aliases'), name='gin_trgm_ops'), name='indexprofile_aliases_trgm'),
+        ),
+    ]
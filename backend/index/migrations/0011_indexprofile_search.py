@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-15 06:49
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+def populate_search(apps, schema_editor):
+    IndexProfile = apps.get_model('index', 'IndexProfile')
+    IndexProfile.objects.update(search=SearchVector('full_name', 'aliases', 'biography'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('index', '0010_indexprofile_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='indexprofile',
+            name='search',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='indexprofile',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search'], name='index_index_search_93ce19_gin'),
+        ),
+        migrations.RunPython(populate_search, migrations.RunPython.noop),
+    ]
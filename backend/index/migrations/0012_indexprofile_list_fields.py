@@ -0,0 +1,90 @@
+# Generated by Django 5.2.18 on 2026-10-15 06:53
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+LIST_COLUMNS = ['aliases', 'strengths', 'weaknesses', 'known_locations', 'known_vehicles', 'surveillance_urls']
+
+
+def _split_to_array_sql(column):
+    # A plain ALTER ... TYPE text[] cannot split 'a, b' and USING forbids
+    # subqueries, so each column is rebuilt through a temporary array column.
+    return [
+        f"ALTER TABLE index_indexprofile ADD COLUMN {column}_list text[] NOT NULL DEFAULT '{{}}'",
+        f"UPDATE index_indexprofile SET {column}_list = ARRAY("
+        f"SELECT btrim(part) FROM regexp_split_to_table(coalesce({column}, ''), E'[,;\\\\n\\\\r]+') AS part "
+        f"WHERE btrim(part) <> '')",
+        f"ALTER TABLE index_indexprofile DROP COLUMN {column}",
+        f"ALTER TABLE index_indexprofile RENAME COLUMN {column}_list TO {column}",
+        f"ALTER TABLE index_indexprofile ALTER COLUMN {column} DROP DEFAULT",
+    ]
+
+
+def _join_to_text_sql(column):
+    return [
+        f"ALTER TABLE index_indexprofile ADD COLUMN {column}_text text NOT NULL DEFAULT ''",
+        f"UPDATE index_indexprofile SET {column}_text = array_to_string({column}, ', ')",
+        f"ALTER TABLE index_indexprofile DROP COLUMN {column}",
+        f"ALTER TABLE index_indexprofile RENAME COLUMN {column}_text TO {column}",
+        f"ALTER TABLE index_indexprofile ALTER COLUMN {column} DROP DEFAULT",
+    ]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('index', '0011_indexprofile_search'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='indexprofile',
+            name='indexprofile_aliases_trgm',
+        ),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    sql=[stmt for column in LIST_COLUMNS for stmt in _split_to_array_sql(column)],
+                    reverse_sql=[stmt for column in LIST_COLUMNS for stmt in _join_to_text_sql(column)],
+                ),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='indexprofile',
+                    name='aliases',
+                    field=django.contrib.postgres.fields.ArrayField(base_field=models.TextField(), blank=True, default=list, help_text='List of aliases.', size=None),
+                ),
+                migrations.AlterField(
+                    model_name='indexprofile',
+                    name='known_locations',
+                    field=django.contrib.postgres.fields.ArrayField(base_field=models.TextField(), blank=True, default=list, size=None),
+                ),
+                migrations.AlterField(
+                    model_name='indexprofile',
+                    name='known_vehicles',
+                    field=django.contrib.postgres.fields.ArrayField(base_field=models.TextField(), blank=True, default=list, size=None),
+                ),
+                migrations.AlterField(
+                    model_name='indexprofile',
+                    name='strengths',
+                    field=django.contrib.postgres.fields.ArrayField(base_field=models.TextField(), blank=True, default=list, size=None),
+                ),
+                migrations.AlterField(
+                    model_name='indexprofile',
+                    name='surveillance_urls',
+                    field=django.contrib.postgres.fields.ArrayField(base_field=models.TextField(), blank=True, default=list, help_text='List of URLs.', size=None),
+                ),
+                migrations.AlterField(
+                    model_name='indexprofile',
+                    name='weaknesses',
+                    field=django.contrib.postgres.fields.ArrayField(base_field=models.TextField(), blank=True, default=list, size=None),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='indexprofile',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['aliases'], name='indexprofile_aliases_gin'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-15 07:40
+
+from django.db import migrations
+
+
+# array_to_string() is only STABLE, so the vector cannot be a generated column;
+# a BEFORE trigger keeps it current for every write path, including
+# QuerySet.update() and bulk_create()/bulk_update().
+CREATE_TRIGGER_SQL = [
+    """
+    CREATE FUNCTION index_indexprofile_search_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search := to_tsvector(
+            COALESCE(NEW.full_name, '') || ' ' ||
+            COALESCE(array_to_string(NEW.aliases, ' '), '') || ' ' ||
+            COALESCE(NEW.biography, '')
+        );
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER index_indexprofile_search_trigger
+    BEFORE INSERT OR UPDATE OF full_name, aliases, biography, search ON index_indexprofile
+    FOR EACH ROW EXECUTE FUNCTION index_indexprofile_search_update()
+    """,
+    # Backfill through the trigger so rows written before it existed are current.
+    "UPDATE index_indexprofile SET search = NULL",
+]
+
+DROP_TRIGGER_SQL = [
+    "DROP TRIGGER IF EXISTS index_indexprofile_search_trigger ON index_indexprofile",
+    "DROP FUNCTION IF EXISTS index_indexprofile_search_update()",
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('index', '0012_indexprofile_list_fields'),
+    ]
+
+    operations = [
+        migrations.RunSQL(sql=CREATE_TRIGGER_SQL, reverse_sql=DROP_TRIGGER_SQL),
+    ]
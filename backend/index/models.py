@@ -1,6 +1,15 @@
+import re
+
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchQuery, SearchVectorField
 from django.db import models
+from django.db.models import Q
+from django.db.models.functions import Upper
 from django.utils import timezone
 
+SEARCH_TERM = re.compile(r'\w+')
+
 class SoftDeleteManager(models.Manager):
     def get_queryset(self):
         return super().get_queryset().filter(deleted_at__isnull=True)
@@ -10,7 +19,7 @@ class IndexProfile(models.Model):
     Represents a single, comprehensive profile in The Index.
     """
     full_name = models.CharField(max_length=255)
-    aliases = models.TextField(blank=True, help_text="Comma-separated list of aliases.")
+    aliases = ArrayField(models.TextField(), default=list, blank=True, help_text="List of aliases.")
     picture_url = models.URLField(max_length=500, blank=True, null=True)
 
     # Core Attributes
@@ -20,23 +29,57 @@ class IndexProfile(models.Model):
 
     # Detailed Information
     biography = models.TextField(blank=True)
-    strengths = models.TextField(blank=True, help_text="Comma-separated list.")
-    weaknesses = models.TextField(blank=True, help_text="Comma-separated list.")
-    known_locations = models.TextField(blank=True, help_text="Comma-separated list.")
-    known_vehicles = models.TextField(blank=True, help_text="Comma-separated list.")
-    surveillance_urls = models.TextField(blank=True, help_text="Comma-separated list of URLs.")
+    strengths = ArrayField(models.TextField(), default=list, blank=True)
+    weaknesses = ArrayField(models.TextField(), default=list, blank=True)
+    known_locations = ArrayField(models.TextField(), default=list, blank=True)
+    known_vehicles = ArrayField(models.TextField(), default=list, blank=True)
+    surveillance_urls = ArrayField(models.TextField(), default=list, blank=True, help_text="List of URLs.")
 
     # Timestamps & Soft Delete
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     deleted_at = models.DateTimeField(null=True, blank=True, default=None)
 
+    # Full-text document over full_name, aliases and biography, kept current
+    # by a database trigger (migration 0013) on every write path.
+    search = SearchVectorField(null=True, editable=False)
+
     objects = SoftDeleteManager()
     all_objects = models.Manager()
 
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search']),
+            models.Index(fields=['full_name']),
+            models.Index(fields=['classification']),
+            models.Index(fields=['status']),
+            models.Index(fields=['threat_level']),
+            models.Index(fields=['deleted_at']),
+            # Trigram indexes over UPPER(col) match the SQL Django emits for icontains.
+            GinIndex(OpClass(Upper('full_name'), name='gin_trgm_ops'), name='indexprofile_name_trgm'),
+            # Element lookups (aliases__contains=[...]) use the default array_ops.
+            GinIndex(fields=['aliases'], name='indexprofile_aliases_gin'),
+        ]
+
     def __str__(self):
         return self.full_name
 
+    @staticmethod
+    def search_filter(query):
+        """Q matching ``query`` through the indexed search paths.
+
+        Every typed word matches as a prefix of a name, alias or biography word
+        (GIN on ``search``), so partial input from the type-ahead pickers still
+        hits; name substrings use the trigram index and whole aliases the array GIN.
+        """
+        match = Q(full_name__icontains=query) | Q(aliases__contains=[query])
+        # Only word characters reach the raw tsquery, so user input cannot break its syntax.
+        terms = SEARCH_TERM.findall(query)
+        if terms:
+            prefixes = ' & '.join(f'{term}:*' for term in terms)
+            match |= Q(search=SearchQuery(prefixes, search_type='raw'))
+        return match
+
 class IndexConnection(models.Model):
     """
     Represents a directional relationship between two IndexProfiles.
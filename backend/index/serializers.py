@@ -1,15 +1,41 @@
+import re
+
+from django.contrib.postgres.fields import ArrayField
 from rest_framework import serializers
 from .models import IndexProfile, IndexConnection
 
 
+class DelimitedListField(serializers.ListField):
+    """A list field that also accepts the comma/semicolon/newline separated strings the UI posts."""
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            data = [part.strip() for part in re.split(r'[,;\n\r]+', data) if part.strip()]
+        return super().to_internal_value(data)
+
+
+
 class IndexProfileSummarySerializer(serializers.ModelSerializer):
     """A lightweight serializer for displaying profile names and IDs."""
     class Meta:
         model = IndexProfile
         fields = ['id', 'full_name']
 
+class IndexProfileListSerializer(serializers.ModelSerializer):
+    """Roster columns only; the long free-text fields are left to the detail view."""
+    class Meta:
+        model = IndexProfile
+        fields = [
+            'id', 'full_name', 'aliases', 'picture_url', 'classification',
+            'status', 'threat_level', 'created_at', 'updated_at'
+        ]
+
 class IndexProfileSerializer(serializers.ModelSerializer):
     # The 'affiliations' field will be dynamically added in the view if needed.
+    serializer_field_mapping = {
+        **serializers.ModelSerializer.serializer_field_mapping,
+        ArrayField: DelimitedListField,
+    }
+
     class Meta:
         model = IndexProfile
         fields = [
@@ -12,7 +12,7 @@ def create_index_profile_for_lineage_agent(sender, instance, created, **kwargs):
         try:
             IndexProfile.objects.create(
                 full_name=(instance.real_name or instance.alias or 'Unknown').strip(),
-                aliases=instance.alias or '',
+                aliases=[instance.alias] if instance.alias else [],
                 classification=IndexProfile.Classification.ASSET_TALON,
                 status=IndexProfile.Status.ACTIVE,
                 threat_level=IndexProfile.ThreatLevel.NONE,
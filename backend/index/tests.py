@@ -0,0 +1,105 @@
+import importlib
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from rest_framework.test import APITestCase
+
+from .models import IndexProfile
+from .serializers import IndexProfileSerializer
+
+list_fields_migration = importlib.import_module('index.migrations.0012_indexprofile_list_fields')
+
+
+class ListFieldsMigrationTests(TestCase):
+    """Runs the 0012 text -> text[] conversion on the test table.
+
+    The test database is built from the models, so the column is first turned
+    back into text with the migration's own reverse SQL.
+    """
+
+    def convert(self, column, text):
+        profile = IndexProfile.objects.create(full_name='Johnny Silver')
+        with connection.cursor() as cursor:
+            for statement in list_fields_migration._join_to_text_sql(column):
+                cursor.execute(statement)
+            cursor.execute(f'UPDATE index_indexprofile SET {column} = %s WHERE id = %s', [text, profile.id])
+            for statement in list_fields_migration._split_to_array_sql(column):
+                cursor.execute(statement)
+            cursor.execute(f'SELECT {column} FROM index_indexprofile WHERE id = %s', [profile.id])
+            return cursor.fetchone()[0]
+
+    def test_splits_on_commas_semicolons_and_newlines(self):
+        self.assertEqual(
+            self.convert('known_locations', 'Docks; Old Mill,\r\nNorth Pier , ;'),
+            ['Docks', 'Old Mill', 'North Pier'],
+        )
+
+    def test_empty_text_becomes_an_empty_array(self):
+        self.assertEqual(self.convert('known_vehicles', ''), [])
+
+
+class DelimitedListFieldTests(TestCase):
+    def test_delimited_string_is_split(self):
+        serializer = IndexProfileSerializer(data={
+            'full_name': 'Johnny Silver',
+            'aliases': 'Ghost; Viper King,\nShade',
+        })
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(serializer.validated_data['aliases'], ['Ghost', 'Viper King', 'Shade'])
+
+    def test_list_is_taken_as_is(self):
+        serializer = IndexProfileSerializer(data={'full_name': 'Johnny Silver', 'aliases': ['Ghost; Shade']})
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(serializer.validated_data['aliases'], ['Ghost; Shade'])
+
+
+class SearchFilterTests(TestCase):
+    def setUp(self):
+        self.johnny = IndexProfile.objects.create(
+            full_name='Johnny Silver', aliases=['Ghost'], biography='Runs the eastern docks.',
+        )
+        self.mara = IndexProfile.objects.create(full_name='Mara Quinn', aliases=['Viper King'])
+
+    def search(self, query):
+        return list(
+            IndexProfile.objects.filter(IndexProfile.search_filter(query))
+            .order_by('full_name').values_list('full_name', flat=True)
+        )
+
+    def test_words_match_as_prefixes_in_any_case(self):
+        self.assertEqual(self.search('gho'), ['Johnny Silver'])
+        self.assertEqual(self.search('VIPER ki'), ['Mara Quinn'])
+        self.assertEqual(self.search('sil joh'), ['Johnny Silver'])
+
+    def test_biography_words_match(self):
+        self.assertEqual(self.search('eastern dock'), ['Johnny Silver'])
+
+    def test_every_word_must_match(self):
+        self.assertEqual(self.search('ghost viper'), [])
+
+    def test_name_substrings_and_whole_aliases_match(self):
+        self.assertEqual(self.search('ra Qui'), ['Mara Quinn'])
+        self.assertEqual(self.search('Viper King'), ['Mara Quinn'])
+
+    def test_punctuation_only_input_matches_nothing(self):
+        self.assertEqual(self.search("&:*!"), [])
+
+    def test_search_vector_follows_bulk_writes(self):
+        # The trigger keeps the vector current for writes that bypass save().
+        IndexProfile.objects.filter(pk=self.johnny.pk).update(aliases=['Specter'])
+        self.assertEqual(self.search('spec'), ['Johnny Silver'])
+        self.assertEqual(self.search('gho'), [])
+        self.mara.biography = 'Keeps the river ledgers.'
+        IndexProfile.objects.bulk_update([self.mara], ['biography'])
+        self.assertEqual(self.search('ledger'), ['Mara Quinn'])
+
+
+class ProfileListSearchTests(APITestCase):
+    def test_q_filters_the_profile_list(self):
+        self.client.force_authenticate(User.objects.create_user('reader', password='pw'))
+        IndexProfile.objects.create(full_name='Johnny Silver', aliases=['Ghost'])
+        IndexProfile.objects.create(full_name='Mara Quinn')
+        response = self.client.get('/api/index/profiles/', {'q': 'gho'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([p['full_name'] for p in response.data], ['Johnny Silver'])
@@ -3,26 +3,48 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import NotFound, PermissionDenied
 
 from .models import IndexProfile, IndexConnection
-from .serializers import IndexProfileSerializer, IndexConnectionSerializer
+from .serializers import IndexProfileSerializer, IndexProfileListSerializer, IndexConnectionSerializer
+from api.pagination import OptInCursorPagination
 from api.permissions import get_user_role, IsHQProtectorOrHeir
 from audit.utils import log_action
 
+class IndexProfilePagination(OptInCursorPagination):
+    # Matches the roster ordering; id breaks ties between identical names.
+    ordering = ('full_name', 'id')
+
 class IndexProfileViewSet(viewsets.ModelViewSet):
     """
     API endpoint for viewing and editing Index profiles.
     """
     serializer_class = IndexProfileSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = IndexProfilePagination
+
+    # Columns the list serializer never reads; skipped unless ?full=1
+    list_deferred_fields = (
+        'biography', 'strengths', 'weaknesses', 'known_locations',
+        'known_vehicles', 'surveillance_urls', 'search',
+    )
+
+    def _is_summary_list(self):
+        return self.action == 'list' and self.request.query_params.get('full') != '1'
+
+    def get_serializer_class(self):
+        if self._is_summary_list():
+            return IndexProfileListSerializer
+        return super().get_serializer_class()
 
     def get_queryset(self):
         qs = IndexProfile.objects.all().order_by('full_name')
+        if self._is_summary_list():
+            qs = qs.defer(*self.list_deferred_fields)
         # Add filtering logic from your app.js
         q = self.request.query_params.get('q')
         if q:
-            qs = qs.filter(Q(full_name__icontains=q) | Q(biography__icontains=q) | Q(aliases__icontains=q))
+            qs = qs.filter(IndexProfile.search_filter(q))
         classification = self.request.query_params.get('classification')
         if classification:
             qs = qs.filter(classification=classification)
@@ -71,7 +93,10 @@ class IndexConnectionViewSet(viewsets.ModelViewSet):
         Automatically set the 'from_profile' based on the URL.
         """
         profile_pk = self.kwargs.get('profile_pk')
-        from_profile = IndexProfile.objects.get(pk=profile_pk)
+        # Fetch just the columns the audit entry and from_profile_details read.
+        from_profile = IndexProfile.objects.only('id', 'full_name', 'classification').filter(pk=profile_pk).first()
+        if from_profile is None:
+            raise NotFound("Profile not found.")
         serializer.save(from_profile=from_profile)
         log_action(self.request.user, f"Created connection from '{from_profile.full_name}'", target=from_profile)
 
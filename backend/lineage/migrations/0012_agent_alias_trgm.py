@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-15 07:07
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lineage', '0011_agent_index_profile'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='agent',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('alias'), name='gin_trgm_ops'), name='agent_alias_trgm'),
+        ),
+    ]
@@ -1,4 +1,6 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from index.models import IndexProfile
 
 class SoftDeleteManager(models.Manager):
@@ -58,5 +60,11 @@ class Agent(models.Model):
     objects = SoftDeleteManager()  # Default manager filters out soft-deleted items
     all_objects = models.Manager() # Manager to access all items, including soft-deleted
 
+    class Meta:
+        indexes = [
+            # Trigram index over UPPER(alias) serves the icontains searches from the personnel picker.
+            GinIndex(OpClass(Upper('alias'), name='gin_trgm_ops'), name='agent_alias_trgm'),
+        ]
+
     def __str__(self):
         return self.alias
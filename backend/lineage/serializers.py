@@ -2,6 +2,12 @@ from rest_framework import serializers
 from .models import Agent
 from index.serializers import IndexProfileSerializer
 
+class AgentSummarySerializer(serializers.ModelSerializer):
+    """A lightweight serializer for displaying an agent's alias and picture."""
+    class Meta:
+        model = Agent
+        fields = ['id', 'alias', 'picture_url']
+
 class AgentSerializer(serializers.ModelSerializer):
     # Use a read-only nested serializer to include public profile details
     index_profile = IndexProfileSerializer(read_only=True)
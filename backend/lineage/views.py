@@ -137,7 +137,7 @@ class AgentViewSet(viewsets.ModelViewSet):
                 'connection_id': c.id,
                 'scales_agent_id': c.scales_agent.id,
                 'scales_agent_alias': c.scales_agent.alias,
-                'relationship': c.relationship,
+                'relationship': Connection.Relationship(c.relationship).name,
                 'created_at': c.created_at,
             }
             for c in qs
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-15 07:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loom', '0003_operationreportlink'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assetrequisition',
+            index=models.Index(fields=['operation', 'status'], name='loom_assetr_operati_e0b699_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='operation',
+            index=models.Index(fields=['-created_at'], name='loom_operat_created_943473_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='operationlog',
+            index=models.Index(fields=['operation', 'timestamp'], name='loom_operat_operati_6b6414_idx'),
+        ),
+    ]
@@ -1,6 +1,9 @@
 from django.db import models
+from django.core.cache import cache
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
 from lineage.models import Agent
 from scales.models import Faction
@@ -42,6 +45,11 @@ class Operation(models.Model):
     ended_at = models.DateTimeField(blank=True, null=True)
     after_action_report = models.TextField(blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at']),
+        ]
+
     def __str__(self):
         return self.codename
 
@@ -62,6 +70,9 @@ class OperationLog(models.Model):
 
     class Meta:
         ordering = ['timestamp']
+        indexes = [
+            models.Index(fields=['operation', 'timestamp']),
+        ]
 
     def __str__(self):
         return f"Log for {self.operation.codename} at {self.timestamp}"
@@ -89,6 +100,15 @@ class Asset(models.Model):
     def __str__(self):
         return f"{self.name} ({self.type})"
 
+def asset_list_cache_key(status=None):
+    """Cache key for the asset list, optionally filtered to one status."""
+    return f"assets:list:{status or 'all'}"
+
+@receiver([post_save, post_delete], sender=Asset)
+def clear_asset_list_cache(sender=None, **kwargs):
+    """Drop every cached asset list; also called after bulk status updates, which send no signals."""
+    cache.delete_many([asset_list_cache_key()] + [asset_list_cache_key(value) for value, _ in Asset.ASSET_STATUS])
+
 class AssetRequisition(models.Model):
     REQ_STATUS = [
         ('PENDING', 'Pending'),
@@ -104,6 +124,11 @@ class AssetRequisition(models.Model):
     note = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['operation', 'status']),
+        ]
+
     def __str__(self):
         return f"{self.asset} for {self.operation} [{self.status}]"
 
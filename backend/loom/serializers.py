@@ -1,7 +1,7 @@
 from rest_framework import serializers
 from .models import Operation, OperationLog, Asset, AssetRequisition, OperationAssignment, OperationReportLink
-from lineage.serializers import AgentSerializer
-from scales.serializers import FactionSerializer
+from lineage.models import Agent
+from scales.serializers import FactionSummarySerializer
 from index.serializers import IndexProfileSummarySerializer
 from codex.serializers import UserDisplaySerializer
 
@@ -23,26 +23,23 @@ class OperationSerializer(serializers.ModelSerializer):
         ]
 
 
+class AssignedAgentSerializer(serializers.ModelSerializer):
+    """Just enough of an agent to list and link them on an operation roster."""
+    class Meta:
+        model = Agent
+        fields = ['id', 'alias']
+
+
 class OperationAssignmentSerializer(serializers.ModelSerializer):
     """Serializer for the agent-operation link, including their role."""
-    agent = AgentSerializer(read_only=True)
+    agent = AssignedAgentSerializer(read_only=True)
+    # Flat copies of the agent's id/alias for clients that read them directly.
+    agent_id = serializers.ReadOnlyField(source='agent.id')
+    alias = serializers.ReadOnlyField(source='agent.alias')
 
     class Meta:
         model = OperationAssignment
-        fields = ['id', 'agent', 'role_in_op']
-
-class OperationDetailSerializer(OperationSerializer):
-    """Detailed serializer for a single operation profile."""
-    personnel = OperationAssignmentSerializer(source='operationassignment_set', many=True, read_only=True)
-    targets = FactionSerializer(many=True, read_only=True) # Faction targets
-    individual_targets = IndexProfileSummarySerializer(many=True, read_only=True) # Profile targets
-    logs = OperationLogSerializer(many=True, read_only=True)
-
-    class Meta(OperationSerializer.Meta):
-        fields = OperationSerializer.Meta.fields + [
-            'personnel', 'targets', 'individual_targets', 'logs',
-            'after_action_report', 'success_probability'
-        ]
+        fields = ['id', 'agent', 'agent_id', 'alias', 'role_in_op']
 
 class AssetSerializer(serializers.ModelSerializer):
     class Meta:
@@ -71,4 +68,21 @@ class OperationReportLinkSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = OperationReportLink
-        fields = ['id', 'operation', 'report_id', 'report_title', 'linked_by', 'linked_by_username', 'linked_at']
+        fields = ['id', 'operation', 'report', 'report_id', 'report_title', 'linked_by', 'linked_by_username', 'linked_at']
+        read_only_fields = ['linked_by']
+        extra_kwargs = {'report': {'write_only': True}}
+
+
+class OperationDetailSerializer(OperationSerializer):
+    """Detailed serializer for a single operation profile."""
+    personnel = OperationAssignmentSerializer(source='operationassignment_set', many=True, read_only=True)
+    targets = FactionSummarySerializer(many=True, read_only=True) # Faction targets
+    individual_targets = IndexProfileSummarySerializer(many=True, read_only=True) # Profile targets
+    logs = OperationLogSerializer(many=True, read_only=True)
+    report_links = OperationReportLinkSerializer(many=True, read_only=True)
+
+    class Meta(OperationSerializer.Meta):
+        fields = OperationSerializer.Meta.fields + [
+            'personnel', 'targets', 'individual_targets', 'logs', 'report_links',
+            'after_action_report', 'success_probability'
+        ]
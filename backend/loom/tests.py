@@ -0,0 +1,239 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from audit.models import AuditLog
+from codex.models import Notification
+from lineage.models import Agent
+from .models import Asset, AssetRequisition, Operation, OperationAssignment
+from .views import OperationViewSet
+
+# Stands in for Redis: the default test cache is a DummyCache.
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class LoomAPITestCase(APITestCase):
+    """Authenticates as a Protector, the role every loom endpoint admits."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('protector', password='pw')
+        self.user.profile.role = 'PROTECTOR'
+        self.user.profile.save()
+        self.client.force_authenticate(self.user)
+        self.operation = Operation.objects.create(codename='Nightfall', objective='Watch the docks.')
+
+    def operation_url(self, action):
+        return f'/api/loom/operations/{self.operation.id}/{action}/'
+
+    def post(self, url, payload=None):
+        # Notifications and cache clears run on commit; execute them inside the test transaction.
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(url, payload or {}, format='json')
+
+    def set_status(self, status):
+        Operation.objects.filter(pk=self.operation.pk).update(status=status)
+
+    def audit_actions(self):
+        return list(AuditLog.objects.order_by('id').values_list('action', flat=True))
+
+
+class OperationTransitionTests(LoomAPITestCase):
+    def test_commence_activates_a_planning_operation(self):
+        response = self.post(self.operation_url('commence'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], 'ACTIVE')
+        self.operation.refresh_from_db()
+        self.assertEqual(self.operation.status, 'ACTIVE')
+        self.assertIsNotNone(self.operation.started_at)
+        self.assertEqual(
+            list(Notification.objects.values_list('user_id', 'message')),
+            [(self.user.id, "Operation 'Nightfall' commenced")],
+        )
+
+    def test_commence_loses_to_a_concurrent_transition(self):
+        # The view read the row while it was PLANNING; another request has since commenced it.
+        stale = Operation.objects.get(pk=self.operation.pk)
+        self.set_status('ACTIVE')
+        with mock.patch.object(OperationViewSet, 'get_object', return_value=stale):
+            response = self.post(self.operation_url('commence'))
+        self.assertEqual(response.status_code, 400)
+        self.operation.refresh_from_db()
+        self.assertIsNone(self.operation.started_at)
+        self.assertFalse(Notification.objects.exists())
+        self.assertEqual(self.audit_actions(), [])
+
+    def test_conclude_records_the_outcome_and_releases_approved_assets(self):
+        self.set_status('ACTIVE')
+        allocated = Asset.objects.create(name='Van', type='VEHICLE', status='ALLOCATED')
+        requested = Asset.objects.create(name='Safehouse', type='PROPERTY')
+        AssetRequisition.objects.create(operation=self.operation, asset=allocated, status='APPROVED')
+        AssetRequisition.objects.create(operation=self.operation, asset=requested, status='PENDING')
+
+        response = self.post(self.operation_url('conclude'), {'outcome': 'SUCCESS', 'report': 'Clean.'})
+        self.assertEqual(response.status_code, 200)
+        self.operation.refresh_from_db()
+        self.assertEqual(self.operation.status, 'CONCLUDED - SUCCESS')
+        self.assertEqual(self.operation.after_action_report, 'Clean.')
+        self.assertIsNotNone(self.operation.ended_at)
+        self.assertEqual(
+            dict(Asset.objects.values_list('name', 'status')),
+            {'Van': 'AVAILABLE', 'Safehouse': 'AVAILABLE'},
+        )
+        self.assertEqual(self.audit_actions(), [
+            "Concluded operation 'Nightfall' (SUCCESS)",
+            "Released 1 asset(s) from operation 'Nightfall'",
+        ])
+
+    def test_conclude_rejects_an_unknown_outcome(self):
+        self.set_status('ACTIVE')
+        response = self.post(self.operation_url('conclude'), {'outcome': 'DRAW'})
+        self.assertEqual(response.status_code, 400)
+        self.operation.refresh_from_db()
+        self.assertEqual(self.operation.status, 'ACTIVE')
+
+    def test_abort_appends_the_reason(self):
+        Operation.objects.filter(pk=self.operation.pk).update(status='ACTIVE', after_action_report='Went in.')
+        response = self.post(self.operation_url('abort'), {'reason': 'Blown cover'})
+        self.assertEqual(response.status_code, 200)
+        self.operation.refresh_from_db()
+        self.assertEqual(self.operation.status, 'COMPROMISED')
+        self.assertEqual(self.operation.after_action_report, 'Went in.\nABORTED: Blown cover')
+        self.assertEqual(self.audit_actions(), ["Aborted operation 'Nightfall'"])
+
+    def test_only_active_operations_can_be_concluded_or_aborted(self):
+        for action, payload in (('conclude', {'outcome': 'SUCCESS'}), ('abort', {})):
+            response = self.post(self.operation_url(action), payload)
+            self.assertEqual(response.status_code, 400)
+        self.operation.refresh_from_db()
+        self.assertEqual(self.operation.status, 'PLANNING')
+
+
+class RequisitionTests(LoomAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.asset = Asset.objects.create(name='Van', type='VEHICLE')
+
+    def request_asset(self, asset=None):
+        return self.post(self.operation_url('requisitions'), {'asset_id': (asset or self.asset).id})
+
+    def test_request_locks_the_asset_row(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.request_asset()
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(any(
+            'FOR UPDATE' in q['sql'] and 'loom_asset' in q['sql'] for q in queries.captured_queries
+        ))
+        self.assertEqual(AssetRequisition.objects.get().status, 'PENDING')
+
+    def test_unavailable_or_already_requested_assets_are_refused(self):
+        self.assertEqual(self.request_asset().status_code, 201)
+        self.assertEqual(self.request_asset().status_code, 400)
+        busy = Asset.objects.create(name='Boat', type='VEHICLE', status='ALLOCATED')
+        self.assertEqual(self.request_asset(busy).status_code, 400)
+        self.assertEqual(AssetRequisition.objects.count(), 1)
+
+    def test_approve_allocates_the_asset_once(self):
+        requisition = AssetRequisition.objects.create(operation=self.operation, asset=self.asset)
+        url = f'/api/loom/requisitions/{requisition.id}/approve/'
+        self.assertEqual(self.post(url).status_code, 200)
+        self.assertEqual(self.post(url).status_code, 400)
+        requisition.refresh_from_db()
+        self.assertEqual((requisition.status, requisition.approved_by), ('APPROVED', self.user))
+        self.asset.refresh_from_db()
+        self.assertEqual(self.asset.status, 'ALLOCATED')
+
+    def test_deny_leaves_the_asset_available(self):
+        requisition = AssetRequisition.objects.create(operation=self.operation, asset=self.asset)
+        response = self.post(f'/api/loom/requisitions/{requisition.id}/deny/')
+        self.assertEqual(response.status_code, 200)
+        requisition.refresh_from_db()
+        self.assertEqual(requisition.status, 'DENIED')
+        self.asset.refresh_from_db()
+        self.assertEqual(self.asset.status, 'AVAILABLE')
+        # A decided requisition cannot be approved afterwards.
+        self.assertEqual(self.post(f'/api/loom/requisitions/{requisition.id}/approve/').status_code, 400)
+        self.asset.refresh_from_db()
+        self.assertEqual(self.asset.status, 'AVAILABLE')
+
+
+class ManagePersonnelTests(LoomAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.kept, self.dropped, self.joined = (
+            Agent.objects.create(alias=alias) for alias in ('Wren', 'Moth', 'Rook')
+        )
+        self.kept_assignment = OperationAssignment.objects.create(
+            operation=self.operation, agent=self.kept, role_in_op='Driver',
+        )
+        OperationAssignment.objects.create(operation=self.operation, agent=self.dropped)
+
+    def roster(self):
+        return dict(
+            OperationAssignment.objects.filter(operation=self.operation).values_list('agent__alias', 'role_in_op')
+        )
+
+    def test_roster_is_diffed_against_the_current_assignments(self):
+        response = self.post(self.operation_url('manage-personnel'), {'assignments': [
+            {'agent_id': self.kept.id, 'role_in_op': 'Lookout'},
+            {'agent_id': self.joined.id},
+        ]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.roster(), {'Wren': 'Lookout', 'Rook': 'Field Agent'})
+        # The kept agent's row is updated in place, not recreated.
+        self.assertTrue(OperationAssignment.objects.filter(pk=self.kept_assignment.pk, role_in_op='Lookout').exists())
+        self.assertEqual(self.audit_actions(), [
+            "Updated personnel roster for operation 'Nightfall'",
+            "Assigned agent 'Rook' to operation 'Nightfall'",
+            "Unassigned agent 'Moth' from operation 'Nightfall'",
+        ])
+
+    def test_unknown_agents_change_nothing(self):
+        response = self.post(self.operation_url('manage-personnel'), {'assignments': [{'agent_id': 9999}]})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.roster(), {'Wren': 'Driver', 'Moth': 'Field Agent'})
+
+    def test_roster_is_frozen_once_active(self):
+        self.set_status('ACTIVE')
+        response = self.post(self.operation_url('manage-personnel'), {'assignments': []})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(self.roster()), 2)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class AssetListCacheTests(LoomAPITestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.asset = Asset.objects.create(name='Van', type='VEHICLE')
+
+    def statuses(self, status_filter=None):
+        params = {'status': status_filter} if status_filter else {}
+        response = self.client.get('/api/loom/assets/', params)
+        self.assertEqual(response.status_code, 200)
+        return [asset['status'] for asset in response.data]
+
+    def test_repeat_list_is_served_from_the_cache(self):
+        self.statuses()
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.statuses(), ['AVAILABLE'])
+        self.assertFalse([q for q in queries.captured_queries if 'loom_asset' in q['sql']])
+
+    def test_approving_a_requisition_clears_the_cache(self):
+        self.assertEqual(self.statuses('AVAILABLE'), ['AVAILABLE'])
+        requisition = AssetRequisition.objects.create(operation=self.operation, asset=self.asset)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'/api/loom/requisitions/{requisition.id}/approve/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.statuses('AVAILABLE'), [])
+        self.assertEqual(self.statuses('ALLOCATED'), ['ALLOCATED'])
+
+    def test_saving_an_asset_clears_the_cache(self):
+        self.statuses()
+        self.asset.status = 'MAINTENANCE'
+        self.asset.save()
+        self.assertEqual(self.statuses(), ['MAINTENANCE'])
@@ -1,44 +1,110 @@
-from rest_framework import viewsets, status, serializers
+import logging
+
+from rest_framework import viewsets, status
 from rest_framework.decorators import action, api_view
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import NotFound, PermissionDenied
+from django.core.cache import cache
 from django.shortcuts import get_object_or_404
-from django.db import transaction
+from django.db import DatabaseError, transaction
+from django.db.models import F, Prefetch
 
 from django.utils import timezone
-from .models import Operation, OperationAssignment, OperationLog, Asset, AssetRequisition, OperationReportLink
+from .models import (
+    Operation, OperationAssignment, OperationLog, Asset, AssetRequisition, OperationReportLink,
+    asset_list_cache_key, clear_asset_list_cache,
+)
 from .serializers import (
-    OperationSerializer,
+    OperationSerializer, OperationDetailSerializer,
     OperationLogSerializer, AssetSerializer, AssetRequisitionSerializer, OperationReportLinkSerializer
 )
+from codex.models import Notification
 from codex.serializers import EchoSerializer
 from scales.models import Faction
 from index.models import IndexProfile
 from lineage.models import Agent
+from users.models import leadership_user_ids
 from api.permissions import get_user_role, IsProtector, IsProtectorOrHeir
-from audit.utils import log_action
+from audit.utils import log_action, log_actions_bulk
 
-class PersonnelAssignmentSerializer(serializers.ModelSerializer):
-    agent_id = serializers.ReadOnlyField(source='agent.id')
-    alias = serializers.ReadOnlyField(source='agent.alias')
+logger = logging.getLogger(__name__)
 
-    class Meta:
-        model = OperationAssignment
-        fields = ['agent_id', 'alias', 'role_in_op']
+OPERATION_STATUS_NOTIFICATION = Notification.Type.OPERATION_STATUS
 
-class OperationDetailSerializer(OperationSerializer):
-    logs = OperationLogSerializer(many=True, read_only=True)
-    personnel = PersonnelAssignmentSerializer(source='operationassignment_set', many=True, read_only=True)
-    report_links = OperationReportLinkSerializer(many=True, read_only=True)
+def _operation_logs():
+    """Log rows with only the columns OperationLogSerializer renders, author name joined in."""
+    return OperationLog.objects.select_related('user__profile').only(
+        'id', 'operation_id', 'message', 'timestamp', 'user__profile__display_name'
+    )
 
-    class Meta(OperationSerializer.Meta):
-        fields = OperationSerializer.Meta.fields + ['logs', 'personnel', 'report_links', 'after_action_report']
+def _release_assets(operation):
+    """Return the operation's allocated assets to the pool.
+
+    Returns the audit entries (at most one, summarising the release) for the
+    caller to record alongside its own.
+    """
+    released = list(
+        Asset.objects.filter(requisitions__operation=operation, requisitions__status='APPROVED')
+        .values('id', 'name')
+    )
+    if not released:
+        return []
+    Asset.objects.filter(pk__in=[asset['id'] for asset in released]).update(status='AVAILABLE')
+    transaction.on_commit(clear_asset_list_cache)
+    return [(
+        f"Released {len(released)} asset(s) from operation '{operation.codename}'",
+        operation,
+        {'assets': released},
+    )]
+
+def _notify_leadership(operation, message):
+    """Notify Protectors and Heirs about an operation status change.
+
+    Deferred until the surrounding transaction commits, so a rolled-back
+    transition never notifies anyone and a notification failure cannot undo
+    the transition.
+    """
+    transaction.on_commit(lambda: _create_leadership_notifications(operation, message))
+
+def _create_leadership_notifications(operation, message):
+    try:
+        Notification.objects.bulk_create([
+            Notification(
+                user_id=user_id,
+                notif_type=OPERATION_STATUS_NOTIFICATION,
+                message=message,
+                metadata={'operation_id': operation.id, 'status': operation.status}
+            ) for user_id in leadership_user_ids()
+        ])
+    except DatabaseError:
+        # The transition has already committed; a missed notification must not fail the request.
+        logger.exception("Could not notify leadership about operation %s", operation.pk)
 
 class OperationViewSet(viewsets.ModelViewSet):
     queryset = Operation.objects.all().order_by('-created_at')
     serializer_class = OperationSerializer
 
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if self.action == 'list':
+            # The roster shows the summary columns only; skip after_action_report and friends.
+            qs = qs.only(*OperationSerializer.Meta.fields)
+        elif self.action in ('retrieve', 'manage_targets'):
+            # Everything OperationDetailSerializer walks, loaded in one query per relation.
+            qs = qs.prefetch_related(
+                Prefetch('operationassignment_set', queryset=OperationAssignment.objects.select_related('agent')),
+                Prefetch('logs', queryset=_operation_logs()),
+                Prefetch('report_links', queryset=OperationReportLink.objects.select_related('report', 'linked_by')),
+            )
+            if self.action == 'retrieve':
+                # manage_targets replaces both sets with .set(), which drops any prefetched rows.
+                qs = qs.prefetch_related(
+                    Prefetch('targets', queryset=Faction.objects.only('id', 'name')),
+                    Prefetch('individual_targets', queryset=IndexProfile.objects.only('id', 'full_name')),
+                )
+        return qs
+
     def get_serializer_class(self):
         if self.action == 'retrieve':
             return OperationDetailSerializer
@@ -73,7 +139,7 @@ class OperationViewSet(viewsets.ModelViewSet):
 
     def perform_update(self, serializer):
         role = get_user_role(self.request.user)
-        operation = self.get_object()
+        operation = serializer.instance  # already fetched (and permission-checked) by update()
 
         if role == 'HEIR' and operation.status != 'PLANNING':
             raise PermissionDenied("Heirs can only edit operations in the PLANNING stage.")
@@ -141,19 +207,22 @@ class OperationViewSet(viewsets.ModelViewSet):
         operation = self.get_object()
         
         if request.method.lower() == 'get':
-            assigned_agents = operation.operationassignment_set.select_related('agent').all()
-            assigned_ids = [a.agent_id for a in assigned_agents]
-            
+            assigned = list(
+                operation.operationassignment_set.annotate(alias=F('agent__alias'))
+                .values('agent_id', 'alias', 'role_in_op')
+            )
+
             # Search for available agents
             query = request.query_params.get('q', '').strip()
             candidates = []
             if query:
-                candidates = Agent.objects.filter(alias__icontains=query).exclude(id__in=assigned_ids)[:10]
+                candidates = list(
+                    Agent.objects.filter(alias__icontains=query)
+                    .exclude(id__in=[a['agent_id'] for a in assigned])
+                    .values('id', 'alias')[:10]
+                )
 
-            return Response({
-                'assigned': [{'agent_id': a.agent.id, 'alias': a.agent.alias, 'role_in_op': a.role_in_op} for a in assigned_agents],
-                'candidates': [{'id': a.id, 'alias': a.alias} for a in candidates]
-            })
+            return Response({'assigned': assigned, 'candidates': candidates})
 
         # POST
         if operation.status != 'PLANNING':
@@ -163,14 +232,49 @@ class OperationViewSet(viewsets.ModelViewSet):
         if not isinstance(assignments, list):
             return Response({'error': 'assignments must be a list.'}, status=status.HTTP_400_BAD_REQUEST)
 
+        try:
+            agent_ids = [int(item['agent_id']) for item in assignments]
+        except (KeyError, TypeError, ValueError):
+            return Response({'error': 'Each assignment needs a numeric agent_id.'}, status=status.HTTP_400_BAD_REQUEST)
+        agents = Agent.objects.in_bulk(agent_ids)
+        if len(agents) != len(set(agent_ids)):
+            raise NotFound('One or more agents do not exist.')
+
+        roles = {agent_id: item.get('role_in_op', 'Field Agent') for agent_id, item in zip(agent_ids, assignments)}
+
         with transaction.atomic():
-            operation.operationassignment_set.all().delete()
-            new_assignments = []
-            for item in assignments:
-                agent = get_object_or_404(Agent, pk=item.get('agent_id'))
-                new_assignments.append(OperationAssignment(operation=operation, agent=agent, role_in_op=item.get('role_in_op', 'Field Agent')))
-            OperationAssignment.objects.bulk_create(new_assignments)
-            log_action(request.user, f"Updated personnel roster for operation '{operation.codename}'", target=operation)
+            # Diff against the current roster so unchanged assignments are left alone.
+            existing = {
+                assignment.agent_id: assignment
+                for assignment in operation.operationassignment_set.select_related('agent').only('role_in_op', 'agent__alias')
+            }
+            removed = [assignment for agent_id, assignment in existing.items() if agent_id not in roles]
+            added = [agent_id for agent_id in roles if agent_id not in existing]
+            changed = [
+                assignment for agent_id, assignment in existing.items()
+                if agent_id in roles and assignment.role_in_op != roles[agent_id]
+            ]
+            if removed:
+                OperationAssignment.objects.filter(pk__in=[assignment.pk for assignment in removed]).delete()
+            if added:
+                OperationAssignment.objects.bulk_create([
+                    OperationAssignment(operation=operation, agent=agents[agent_id], role_in_op=roles[agent_id])
+                    for agent_id in added
+                ])
+            if changed:
+                for assignment in changed:
+                    assignment.role_in_op = roles[assignment.agent_id]
+                OperationAssignment.objects.bulk_update(changed, ['role_in_op'])
+            entries = [(f"Updated personnel roster for operation '{operation.codename}'", operation, None)]
+            entries += [
+                (f"Assigned agent '{agents[agent_id].alias}' to operation '{operation.codename}'", operation, None)
+                for agent_id in added
+            ]
+            entries += [
+                (f"Unassigned agent '{assignment.agent.alias}' from operation '{operation.codename}'", operation, None)
+                for assignment in removed
+            ]
+            log_actions_bulk(request.user, entries)
 
         return Response({'status': 'personnel updated'}, status=status.HTTP_200_OK)
 
@@ -180,26 +284,15 @@ class OperationViewSet(viewsets.ModelViewSet):
         operation = self.get_object()
         if operation.status != 'PLANNING':
             return Response({'error': 'Operation is not in the PLANNING stage.'}, status=status.HTTP_400_BAD_REQUEST)
-        
-        operation.status = 'ACTIVE'
-        operation.started_at = timezone.now()
-        operation.save()
-        log_action(request.user, f"Commenced operation '{operation.codename}'", target=operation)
-        # Notify leadership about operation status change
-        try:
-            from django.contrib.auth.models import User as DjangoUser
-            from codex.models import Notification
-            recipients = DjangoUser.objects.filter(profile__role__in=['PROTECTOR', 'HEIR']).distinct()
-            Notification.objects.bulk_create([
-                Notification(
-                    user=u,
-                    notif_type=Notification.Type.OPERATION_STATUS,
-                    message=f"Operation '{operation.codename}' commenced",
-                    metadata={'operation_id': operation.id, 'status': operation.status}
-                ) for u in recipients
-            ])
-        except Exception:
-            pass
+
+        now = timezone.now()
+        with transaction.atomic():
+            # Conditional UPDATE: only the request that actually moves it out of PLANNING wins.
+            if not Operation.objects.filter(pk=operation.pk, status='PLANNING').update(status='ACTIVE', started_at=now, updated_at=now):
+                return Response({'error': 'Operation is not in the PLANNING stage.'}, status=status.HTTP_400_BAD_REQUEST)
+            operation.status, operation.started_at, operation.updated_at = 'ACTIVE', now, now
+            log_action(request.user, f"Commenced operation '{operation.codename}'", target=operation)
+            _notify_leadership(operation, f"Operation '{operation.codename}' commenced")
         return Response(self.get_serializer(operation).data, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=['post'], url_path='conclude')
@@ -211,30 +304,22 @@ class OperationViewSet(viewsets.ModelViewSet):
         report = request.data.get('report', '')
         if outcome not in ['SUCCESS', 'FAILURE']:
             return Response({'error': 'Invalid outcome. Use SUCCESS or FAILURE.'}, status=status.HTTP_400_BAD_REQUEST)
-        operation.status = 'CONCLUDED - SUCCESS' if outcome == 'SUCCESS' else 'CONCLUDED - FAILURE'
-        operation.after_action_report = report
-        operation.ended_at = timezone.now()
-        operation.save()
-        # Release allocated assets for this operation
-        approved = AssetRequisition.objects.filter(operation=operation, status='APPROVED').select_related('asset')
-        for req in approved:
-            req.asset.status = 'AVAILABLE'
-            req.asset.save(update_fields=['status'])
-        log_action(request.user, f"Concluded operation '{operation.codename}' ({outcome})", target=operation)
-        try:
-            from django.contrib.auth.models import User as DjangoUser
-            from codex.models import Notification
-            recipients = DjangoUser.objects.filter(profile__role__in=['PROTECTOR', 'HEIR']).distinct()
-            Notification.objects.bulk_create([
-                Notification(
-                    user=u,
-                    notif_type=Notification.Type.OPERATION_STATUS,
-                    message=f"Operation '{operation.codename}' concluded: {outcome}",
-                    metadata={'operation_id': operation.id, 'status': operation.status}
-                ) for u in recipients
+        changes = {
+            'status': 'CONCLUDED - SUCCESS' if outcome == 'SUCCESS' else 'CONCLUDED - FAILURE',
+            'after_action_report': report,
+            'ended_at': timezone.now(),
+        }
+        changes['updated_at'] = changes['ended_at']
+        with transaction.atomic():
+            if not Operation.objects.filter(pk=operation.pk, status='ACTIVE').update(**changes):
+                return Response({'error': 'Only ACTIVE operations can be concluded.'}, status=status.HTTP_400_BAD_REQUEST)
+            for field, value in changes.items():
+                setattr(operation, field, value)
+            log_actions_bulk(request.user, [
+                (f"Concluded operation '{operation.codename}' ({outcome})", operation, None),
+                *_release_assets(operation),
             ])
-        except Exception:
-            pass
+            _notify_leadership(operation, f"Operation '{operation.codename}' concluded: {outcome}")
         return Response(self.get_serializer(operation).data)
 
     @action(detail=True, methods=['post'], url_path='abort')
@@ -243,36 +328,29 @@ class OperationViewSet(viewsets.ModelViewSet):
         if operation.status != 'ACTIVE':
             return Response({'error': 'Only ACTIVE operations can be aborted.'}, status=status.HTTP_400_BAD_REQUEST)
         reason = request.data.get('reason', '')
-        operation.status = 'COMPROMISED'
-        operation.after_action_report = (operation.after_action_report or '') + (f"\nABORTED: {reason}" if reason else '')
-        operation.ended_at = timezone.now()
-        operation.save()
-        approved = AssetRequisition.objects.filter(operation=operation, status='APPROVED').select_related('asset')
-        for req in approved:
-            req.asset.status = 'AVAILABLE'
-            req.asset.save(update_fields=['status'])
-        log_action(request.user, f"Aborted operation '{operation.codename}'", target=operation)
-        try:
-            from django.contrib.auth.models import User as DjangoUser
-            from codex.models import Notification
-            recipients = DjangoUser.objects.filter(profile__role__in=['PROTECTOR', 'HEIR']).distinct()
-            Notification.objects.bulk_create([
-                Notification(
-                    user=u,
-                    notif_type=Notification.Type.OPERATION_STATUS,
-                    message=f"Operation '{operation.codename}' aborted",
-                    metadata={'operation_id': operation.id, 'status': operation.status}
-                ) for u in recipients
+        changes = {
+            'status': 'COMPROMISED',
+            'after_action_report': (operation.after_action_report or '') + (f"\nABORTED: {reason}" if reason else ''),
+            'ended_at': timezone.now(),
+        }
+        changes['updated_at'] = changes['ended_at']
+        with transaction.atomic():
+            if not Operation.objects.filter(pk=operation.pk, status='ACTIVE').update(**changes):
+                return Response({'error': 'Only ACTIVE operations can be aborted.'}, status=status.HTTP_400_BAD_REQUEST)
+            for field, value in changes.items():
+                setattr(operation, field, value)
+            log_actions_bulk(request.user, [
+                (f"Aborted operation '{operation.codename}'", operation, None),
+                *_release_assets(operation),
             ])
-        except Exception:
-            pass
+            _notify_leadership(operation, f"Operation '{operation.codename}' aborted")
         return Response(self.get_serializer(operation).data)
 
     @action(detail=True, methods=['get', 'post'], url_path='logs')
     def logs(self, request, pk=None):
         operation = self.get_object()
         if request.method.lower() == 'get':
-            qs = operation.logs.all()
+            qs = _operation_logs().filter(operation=operation)
             return Response(OperationLogSerializer(qs, many=True).data)
         # POST: add log entry
         if operation.status != 'ACTIVE':
@@ -294,22 +372,36 @@ class OperationViewSet(viewsets.ModelViewSet):
         asset_id = request.data.get('asset_id')
         if not asset_id:
             return Response({'error': 'asset_id is required'}, status=status.HTTP_400_BAD_REQUEST)
-        asset = get_object_or_404(Asset, pk=asset_id)
-        if asset.status != 'AVAILABLE':
-            return Response({'error': 'Asset is not available'}, status=status.HTTP_400_BAD_REQUEST)
-        req, created = AssetRequisition.objects.get_or_create(
-            operation=operation, asset=asset,
-            defaults={'requested_by': request.user, 'status': 'PENDING'}
-        )
-        if not created:
-            return Response({'error': 'Requisition already exists for this asset.'}, status=status.HTTP_400_BAD_REQUEST)
-        log_action(request.user, f"Requested asset '{asset.name}' for operation '{operation.codename}'", target=operation)
+        with transaction.atomic():
+            # Lock the asset row so concurrent requests for it are checked one at a time.
+            asset = get_object_or_404(Asset.objects.select_for_update(), pk=asset_id)
+            if asset.status != 'AVAILABLE':
+                return Response({'error': 'Asset is not available'}, status=status.HTTP_400_BAD_REQUEST)
+            if operation.requisitions.filter(asset=asset).exists():
+                return Response({'error': 'Requisition already exists for this asset.'}, status=status.HTTP_400_BAD_REQUEST)
+            req = AssetRequisition.objects.create(operation=operation, asset=asset, requested_by=request.user, status='PENDING')
+            log_action(request.user, f"Requested asset '{asset.name}' for operation '{operation.codename}'", target=operation)
         return Response(AssetRequisitionSerializer(req).data, status=status.HTTP_201_CREATED)
 
 class AssetViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Asset.objects.all().order_by('name')
     serializer_class = AssetSerializer
     permission_classes = [IsAuthenticated]
+    list_cache_timeout = 300
+
+    def list(self, request, *args, **kwargs):
+        # The asset pool is small and changes only on requisition decisions and
+        # operation close-out, which clear these entries (see clear_asset_list_cache).
+        # Only Redis backs the cache (see CACHES); without it every call reads the table.
+        status_filter = request.query_params.get('status')
+        if status_filter and status_filter not in dict(Asset.ASSET_STATUS):
+            return super().list(request, *args, **kwargs)
+        key = asset_list_cache_key(status_filter)
+        data = cache.get(key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(key, data, self.list_cache_timeout)
+        return Response(data)
 
     def get_queryset(self):
         qs = super().get_queryset()
@@ -328,12 +420,14 @@ class AssetRequisitionViewSet(viewsets.ReadOnlyModelViewSet):
         req = self.get_object()
         if req.status != 'PENDING':
             return Response({'error': 'Requisition is not pending.'}, status=status.HTTP_400_BAD_REQUEST)
-        req.status = 'APPROVED'
-        req.approved_by = request.user
-        req.decided_at = timezone.now()
-        req.save(update_fields=['status', 'approved_by', 'decided_at'])
+        now = timezone.now()
+        with transaction.atomic():
+            if not AssetRequisition.objects.filter(pk=req.pk, status='PENDING').update(status='APPROVED', approved_by=request.user, decided_at=now):
+                return Response({'error': 'Requisition is not pending.'}, status=status.HTTP_400_BAD_REQUEST)
+            Asset.objects.filter(pk=req.asset_id).update(status='ALLOCATED')
+            transaction.on_commit(clear_asset_list_cache)
+        req.status, req.approved_by, req.decided_at = 'APPROVED', request.user, now
         req.asset.status = 'ALLOCATED'
-        req.asset.save(update_fields=['status'])
         log_action(request.user, f"Approved asset '{req.asset.name}' for operation '{req.operation.codename}'", target=req.operation)
         return Response(AssetRequisitionSerializer(req).data)
 
@@ -342,10 +436,10 @@ class AssetRequisitionViewSet(viewsets.ReadOnlyModelViewSet):
         req = self.get_object()
         if req.status != 'PENDING':
             return Response({'error': 'Requisition is not pending.'}, status=status.HTTP_400_BAD_REQUEST)
-        req.status = 'DENIED'
-        req.approved_by = request.user
-        req.decided_at = timezone.now()
-        req.save(update_fields=['status', 'approved_by', 'decided_at'])
+        now = timezone.now()
+        if not AssetRequisition.objects.filter(pk=req.pk, status='PENDING').update(status='DENIED', approved_by=request.user, decided_at=now):
+            return Response({'error': 'Requisition is not pending.'}, status=status.HTTP_400_BAD_REQUEST)
+        req.status, req.approved_by, req.decided_at = 'DENIED', request.user, now
         log_action(request.user, f"Denied asset '{req.asset.name}' for operation '{req.operation.codename}'", target=req.operation)
         return Response(AssetRequisitionSerializer(req).data)
 
@@ -353,10 +447,11 @@ class OperationReportLinkViewSet(viewsets.ModelViewSet):
     """
     API endpoint that allows linking reports to operations.
     """
-    queryset = OperationReportLink.objects.all()
+    queryset = OperationReportLink.objects.select_related('report', 'linked_by').all()
     serializer_class = OperationReportLinkSerializer
     permission_classes = [IsProtectorOrHeir]
 
     def perform_create(self, serializer):
-        serializer.save(linked_by=self.request.user)
-        log_action(self.request.user, f"Linked report to operation", target=serializer.instance.operation)
+        # operation and report come back from validation as instances, so this needs no extra reads.
+        link = serializer.save(linked_by=self.request.user)
+        log_action(self.request.user, f"Linked report '{link.report.title}' to operation '{link.operation.codename}'", target=link.operation)
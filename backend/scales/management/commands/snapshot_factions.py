@@ -0,0 +1,9 @@
+from django.core.management.base import BaseCommand
+from scales.models import FactionHistory
+
+class Command(BaseCommand):
+    help = "Records a threat/membership history snapshot for every active faction"
+
+    def handle(self, *args, **options):
+        snapshots = FactionHistory.snapshot_all()
+        self.stdout.write(self.style.SUCCESS(f'Recorded {len(snapshots)} faction snapshots.'))
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-15 07:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scales', '0009_alter_factionmembership_affiliation'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='agent',
+            name='alias',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='faction',
+            name='supa_uuid',
+            field=models.UUIDField(blank=True, db_index=True, help_text='Supabase factions UUID (for Index linkage)', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='agent',
+            index=models.Index(fields=['deleted_at'], name='scales_agen_deleted_79a02b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='faction',
+            index=models.Index(fields=['deleted_at'], name='scales_fact_deleted_7e224e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='factionhistory',
+            index=models.Index(fields=['faction', 'timestamp'], name='scales_fact_faction_adf7b7_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='agent',
+            constraint=models.UniqueConstraint(condition=models.Q(('deleted_at__isnull', True)), fields=('alias',), name='scales_agent_live_alias_uniq'),
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.2.18 on 2026-10-15 07:11
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+LIST_COLUMNS = [
+    ('scales_agent', 'surveillance_images'),
+    ('scales_faction', 'allies'),
+    ('scales_faction', 'rivals'),
+    ('scales_faction', 'surveillance_urls'),
+]
+
+
+def _split_to_array_sql(table, column):
+    # Same temporary-column rebuild as index 0012: USING cannot hold the
+    # subquery that splits 'a, b' into separate elements.
+    return [
+        f"ALTER TABLE {table} ADD COLUMN {column}_list text[] NOT NULL DEFAULT '{{}}'",
+        f"UPDATE {table} SET {column}_list = ARRAY("
+        f"SELECT btrim(part) FROM regexp_split_to_table(coalesce({column}, ''), E'[,;\\\\n\\\\r]+') AS part "
+        f"WHERE btrim(part) <> '')",
+        f"ALTER TABLE {table} DROP COLUMN {column}",
+        f"ALTER TABLE {table} RENAME COLUMN {column}_list TO {column}",
+        f"ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT",
+    ]
+
+
+def _join_to_text_sql(table, column):
+    return [
+        f"ALTER TABLE {table} ADD COLUMN {column}_text text NOT NULL DEFAULT ''",
+        f"UPDATE {table} SET {column}_text = array_to_string({column}, ', ')",
+        f"ALTER TABLE {table} DROP COLUMN {column}",
+        f"ALTER TABLE {table} RENAME COLUMN {column}_text TO {column}",
+        f"ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT",
+    ]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scales', '0010_soft_delete_indexes'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    sql=[stmt for table, column in LIST_COLUMNS for stmt in _split_to_array_sql(table, column)],
+                    reverse_sql=[stmt for table, column in LIST_COLUMNS for stmt in _join_to_text_sql(table, column)],
+                ),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='agent',
+                    name='surveillance_images',
+                    field=django.contrib.postgres.fields.ArrayField(base_field=models.TextField(), blank=True, default=list, help_text='List of surveillance image URLs.', size=None),
+                ),
+                migrations.AlterField(
+                    model_name='faction',
+                    name='allies',
+                    field=django.contrib.postgres.fields.ArrayField(base_field=models.TextField(), blank=True, default=list, size=None),
+                ),
+                migrations.AlterField(
+                    model_name='faction',
+                    name='rivals',
+                    field=django.contrib.postgres.fields.ArrayField(base_field=models.TextField(), blank=True, default=list, size=None),
+                ),
+                migrations.AlterField(
+                    model_name='faction',
+                    name='surveillance_urls',
+                    field=django.contrib.postgres.fields.ArrayField(base_field=models.TextField(), blank=True, default=list, help_text='List of surveillance file URLs.', size=None),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-15 07:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scales', '0011_list_fields'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='agent',
+            name='scales_agent_live_alias_uniq',
+        ),
+        migrations.AddConstraint(
+            model_name='agent',
+            constraint=models.UniqueConstraint(condition=models.Q(('deleted_at__isnull', True), models.Q(('alias', ''), _negated=True)), fields=('alias',), name='scales_agent_live_alias_uniq'),
+        ),
+    ]
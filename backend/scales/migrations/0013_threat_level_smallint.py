@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-15 07:14
+
+from django.db import migrations, models
+
+
+THREAT_LEVELS = ['DORMANT', 'NOMINAL', 'ELEVATED', 'SEVERE', 'CRITICAL']
+
+
+def _names_to_numbers_sql(table, fallback):
+    # Rewrite the names as digit strings first so AlterField's ::smallint
+    # cast can convert the column in place.
+    cases = ' '.join(f"WHEN '{name}' THEN '{value}'" for value, name in enumerate(THREAT_LEVELS))
+    return f"UPDATE {table} SET threat_level = CASE upper(btrim(threat_level)) {cases} ELSE {fallback} END"
+
+
+def _numbers_to_names_sql(table):
+    cases = ' '.join(f"WHEN '{value}' THEN '{name}'" for value, name in enumerate(THREAT_LEVELS))
+    return f"UPDATE {table} SET threat_level = CASE threat_level {cases} ELSE threat_level END"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scales', '0012_agent_alias_skip_blank'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=[
+                _names_to_numbers_sql('scales_faction', "'0'"),
+                _names_to_numbers_sql('scales_factionhistory', 'NULL'),
+            ],
+            reverse_sql=[
+                _numbers_to_names_sql('scales_faction'),
+                _numbers_to_names_sql('scales_factionhistory'),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='faction',
+            name='threat_level',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'Dormant'), (1, 'Nominal'), (2, 'Elevated'), (3, 'Severe'), (4, 'Critical')], default=0),
+        ),
+        migrations.AlterField(
+            model_name='factionhistory',
+            name='threat_level',
+            field=models.PositiveSmallIntegerField(blank=True, choices=[(0, 'Dormant'), (1, 'Nominal'), (2, 'Elevated'), (3, 'Severe'), (4, 'Critical')], null=True),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-15 07:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scales', '0013_threat_level_smallint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='factionhistory',
+            name='updated_by_username',
+            field=models.CharField(blank=True, max_length=150),
+        ),
+        migrations.RunSQL(
+            sql=(
+                "UPDATE scales_factionhistory SET updated_by_username = auth_user.username "
+                "FROM auth_user WHERE auth_user.id = scales_factionhistory.updated_by_id"
+            ),
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
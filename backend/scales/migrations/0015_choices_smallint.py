@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-15 07:18
+
+from django.db import migrations, models
+
+
+# (table, column, stored strings in IntegerChoices order, fallback for unknown values)
+CHOICE_COLUMNS = [
+    ('scales_connection', 'relationship',
+     ['INFORMANT', 'LEVERAGE', 'FAMILY_TIE', 'PAST_AFFILIATION', 'RIVAL', 'HANDLER'], None),
+    ('scales_factiondiplomacy', 'relation', ['ALLY', 'RIVAL', 'NEUTRAL'], 'NEUTRAL'),
+    ('scales_factionmembership', 'affiliation',
+     ['Leader', 'High ranking member', 'Member', 'Associate', 'Hangaround',
+      'Affiliate', 'Supporter', 'Informant', 'Unknown'], 'Associate'),
+]
+
+
+def _strings_to_numbers_sql(table, column, strings, fallback):
+    # As in 0013: rewrite to digit strings so AlterField's ::smallint cast
+    # converts in place. Without a fallback, an unknown value fails the cast.
+    cases = ' '.join(f"WHEN '{text.lower()}' THEN '{value}'" for value, text in enumerate(strings))
+    default = f"'{strings.index(fallback)}'" if fallback else column
+    return f"UPDATE {table} SET {column} = CASE lower(btrim({column})) {cases} ELSE {default} END"
+
+
+def _numbers_to_strings_sql(table, column, strings, fallback):
+    cases = ' '.join(f"WHEN '{value}' THEN '{text}'" for value, text in enumerate(strings))
+    return f"UPDATE {table} SET {column} = CASE {column} {cases} ELSE {column} END"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scales', '0014_factionhistory_updated_by_username'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=[_strings_to_numbers_sql(*spec) for spec in CHOICE_COLUMNS],
+            reverse_sql=[_numbers_to_strings_sql(*spec) for spec in CHOICE_COLUMNS],
+        ),
+        migrations.AlterField(
+            model_name='connection',
+            name='relationship',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'Informant'), (1, 'Leverage (Blackmail)'), (2, 'Family Tie'), (3, 'Past Affiliation'), (4, 'Rival'), (5, 'Handler')]),
+        ),
+        migrations.AlterField(
+            model_name='factiondiplomacy',
+            name='relation',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'Ally'), (1, 'Rival'), (2, 'Neutral')], default=2),
+        ),
+        migrations.AlterField(
+            model_name='factionmembership',
+            name='affiliation',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'Leader'), (1, 'High ranking member'), (2, 'Member'), (3, 'Associate'), (4, 'Hangaround'), (5, 'Affiliate'), (6, 'Supporter'), (7, 'Informant'), (8, 'Unknown')], default=3),
+        ),
+    ]
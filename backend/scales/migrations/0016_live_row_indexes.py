@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-15 07:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scales', '0015_choices_smallint'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='agent',
+            name='scales_agen_deleted_79a02b_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='faction',
+            name='scales_fact_deleted_7e224e_idx',
+        ),
+        migrations.AddIndex(
+            model_name='agent',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['alias'], name='scales_agent_live_alias_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='faction',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['name'], name='scales_faction_live_name_idx'),
+        ),
+    ]
@@ -1,3 +1,4 @@
+from django.contrib.postgres.fields import ArrayField
 from django.db import models
 from django.utils import timezone
 from index.models import IndexProfile
@@ -9,54 +10,81 @@ class SoftDeleteManager(models.Manager):
 class Agent(models.Model):
     """ Represents an external agent or contact within The Scales. """
     name = models.CharField(max_length=255, blank=True, help_text="The agent's real name, if known.")
-    alias = models.CharField(max_length=100, unique=True, blank=True)
+    alias = models.CharField(max_length=100, blank=True)
     rank = models.CharField(max_length=100, blank=True)
     strengths = models.TextField(blank=True)
     weaknesses = models.TextField(blank=True)
     known_locations = models.TextField(blank=True)
     known_vehicles = models.TextField(blank=True)
     picture_url = models.URLField(max_length=500, blank=True, null=True)
-    surveillance_images = models.TextField(blank=True, help_text="Comma-separated URLs of surveillance images.")
+    surveillance_images = ArrayField(models.TextField(), blank=True, default=list, help_text="List of surveillance image URLs.")
     threat_level = models.PositiveIntegerField(default=50, blank=True, null=True, help_text="A score from 0-100 indicating threat level.")
     deleted_at = models.DateTimeField(null=True, blank=True, default=None)
 
     objects = SoftDeleteManager()
     all_objects = models.Manager()
 
+    class Meta:
+        indexes = [
+            # Matches SoftDeleteManager's filter plus the list ordering.
+            models.Index(fields=['alias'], condition=models.Q(deleted_at__isnull=True), name='scales_agent_live_alias_idx'),
+        ]
+        constraints = [
+            # Archived agents keep their alias without blocking its reuse, and
+            # agents without an alias don't collide on the empty string.
+            models.UniqueConstraint(
+                fields=['alias'],
+                condition=models.Q(deleted_at__isnull=True) & ~models.Q(alias=''),
+                name='scales_agent_live_alias_uniq',
+            ),
+        ]
+
     def __str__(self):
         return self.alias
 
 class Faction(models.Model):
     name = models.CharField(max_length=150, unique=True)
-    class ThreatLevel(models.TextChoices):
-        DORMANT = 'DORMANT', 'Dormant'
-        NOMINAL = 'NOMINAL', 'Nominal'
-        ELEVATED = 'ELEVATED', 'Elevated'
-        SEVERE = 'SEVERE', 'Severe'
-        CRITICAL = 'CRITICAL', 'Critical'
-
-    threat_level = models.CharField(max_length=20, choices=ThreatLevel.choices, default=ThreatLevel.DORMANT)
+    class ThreatLevel(models.IntegerChoices):
+        # Stored as ordered integers; the API speaks the member names.
+        DORMANT = 0, 'Dormant'
+        NOMINAL = 1, 'Nominal'
+        ELEVATED = 2, 'Elevated'
+        SEVERE = 3, 'Severe'
+        CRITICAL = 4, 'Critical'
+
+    threat_level = models.PositiveSmallIntegerField(choices=ThreatLevel.choices, default=ThreatLevel.DORMANT)
     description = models.TextField(blank=True)
     is_active = models.BooleanField(default=True)
     picture_url = models.URLField(max_length=500, blank=True, null=True)
-    supa_uuid = models.UUIDField(blank=True, null=True, help_text="Supabase factions UUID (for Index linkage)")
+    supa_uuid = models.UUIDField(blank=True, null=True, db_index=True, help_text="Supabase factions UUID (for Index linkage)")
 
     strengths = models.TextField(blank=True)
     weaknesses = models.TextField(blank=True)
-    allies = models.TextField(blank=True, default='')
-    rivals = models.TextField(blank=True, default='')
-    surveillance_urls = models.TextField(blank=True, help_text="Comma-separated list of surveillance file URLs.")
+    allies = ArrayField(models.TextField(), blank=True, default=list)
+    rivals = ArrayField(models.TextField(), blank=True, default=list)
+    surveillance_urls = ArrayField(models.TextField(), blank=True, default=list, help_text="List of surveillance file URLs.")
     members = models.ManyToManyField(IndexProfile, through='FactionMembership', related_name='faction_affiliations', blank=True)
     deleted_at = models.DateTimeField(null=True, blank=True, default=None)
 
     objects = SoftDeleteManager()
     all_objects = models.Manager()
 
+    class Meta:
+        indexes = [
+            # Matches SoftDeleteManager's filter plus the list ordering.
+            models.Index(fields=['name'], condition=models.Q(deleted_at__isnull=True), name='scales_faction_live_name_idx'),
+        ]
+
     def __str__(self):
         return self.name
     
     @property
     def member_count(self):
+        # List querysets annotate the count up front (see
+        # FactionSerializer.setup_eager_loading); fall back to a COUNT query.
+        annotated = getattr(self, 'annotated_member_count', None)
+        if annotated is not None:
+            return annotated
         try:
             return self.memberships.count()
         except AttributeError:
@@ -70,30 +98,62 @@ class FactionHistory(models.Model):
     """Historical snapshots for a faction's key indicators."""
     faction = models.ForeignKey(Faction, related_name='history', on_delete=models.CASCADE)
     timestamp = models.DateTimeField(auto_now_add=True)
-    threat_level = models.CharField(max_length=20, null=True, blank=True)
+    threat_level = models.PositiveSmallIntegerField(choices=Faction.ThreatLevel.choices, null=True, blank=True)
     member_count = models.IntegerField(null=True, blank=True)
     updated_by = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL)
+    # Copied from updated_by so history can be listed without joining users,
+    # and still names the author after the account is deleted.
+    updated_by_username = models.CharField(max_length=150, blank=True)
 
     class Meta:
         ordering = ['timestamp']
+        indexes = [
+            models.Index(fields=['faction', 'timestamp']),
+        ]
 
     def __str__(self):
         return f"{self.faction.name} @ {self.timestamp:%Y-%m-%d %H:%M}"
 
+    def save(self, *args, **kwargs):
+        if self.updated_by is not None and not self.updated_by_username:
+            self.updated_by_username = self.updated_by.get_username()
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def snapshot_all(cls, user=None):
+        """Record a snapshot for every live faction in one SELECT and one INSERT."""
+        factions = Faction.objects.annotate(
+            annotated_member_count=models.Count('memberships'),
+        ).only('id', 'threat_level')
+        return cls.objects.bulk_create(
+            [
+                cls(
+                    faction_id=faction.id,
+                    threat_level=faction.threat_level,
+                    member_count=faction.annotated_member_count,
+                    updated_by=user,
+                    updated_by_username=user.get_username() if user else '',
+                )
+                for faction in factions
+            ],
+            batch_size=1000,
+        )
+
 from lineage.models import Agent as LineageAgent
 
 class Connection(models.Model):
-    class Relationship(models.TextChoices):
-        INFORMANT = 'INFORMANT', 'Informant'
-        LEVERAGE = 'LEVERAGE', 'Leverage (Blackmail)'
-        FAMILY_TIE = 'FAMILY_TIE', 'Family Tie'
-        PAST_AFFILIATION = 'PAST_AFFILIATION', 'Past Affiliation'
-        RIVAL = 'RIVAL', 'Rival'
-        HANDLER = 'HANDLER', 'Handler'
+    class Relationship(models.IntegerChoices):
+        # The API speaks the member names (INFORMANT, ...).
+        INFORMANT = 0, 'Informant'
+        LEVERAGE = 1, 'Leverage (Blackmail)'
+        FAMILY_TIE = 2, 'Family Tie'
+        PAST_AFFILIATION = 3, 'Past Affiliation'
+        RIVAL = 4, 'Rival'
+        HANDLER = 5, 'Handler'
 
     scales_agent = models.ForeignKey(Agent, related_name='connections', on_delete=models.CASCADE)
     lineage_agent = models.ForeignKey(LineageAgent, related_name='external_connections', on_delete=models.CASCADE)
-    relationship = models.CharField(max_length=32, choices=Relationship.choices)
+    relationship = models.PositiveSmallIntegerField(choices=Relationship.choices)
     note = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -101,19 +161,22 @@ class Connection(models.Model):
         unique_together = ('scales_agent', 'lineage_agent')
 
     def __str__(self):
-        return f"{self.scales_agent.alias} ↔ {self.lineage_agent.alias} ({self.get_relationship_display()})"
+        label = _RELATIONSHIP_LABELS.get(self.relationship, self.relationship)
+        return f"{self.scales_agent.alias} ↔ {self.lineage_agent.alias} ({label})"
+
+_RELATIONSHIP_LABELS = dict(Connection.Relationship.choices)
 
 class FactionDiplomacy(models.Model):
     """Defines a diplomatic relationship (e.g., ally, rival) between two factions."""
-    class Relation(models.TextChoices):
-        ALLY = 'ALLY', 'Ally'
-        RIVAL = 'RIVAL', 'Rival'
-        NEUTRAL = 'NEUTRAL', 'Neutral'
+    class Relation(models.IntegerChoices):
+        ALLY = 0, 'Ally'
+        RIVAL = 1, 'Rival'
+        NEUTRAL = 2, 'Neutral'
 
     source = models.ForeignKey(Faction, related_name='diplomacy_outgoing', on_delete=models.CASCADE)
     target = models.ForeignKey(Faction, related_name='diplomacy_incoming', on_delete=models.CASCADE, null=True, blank=True)
     target_name = models.CharField(max_length=150, blank=True, help_text="Name of the target if it's not in the system.")
-    relation = models.CharField(max_length=32, choices=Relation.choices, default=Relation.NEUTRAL)
+    relation = models.PositiveSmallIntegerField(choices=Relation.choices, default=Relation.NEUTRAL)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -122,27 +185,67 @@ class FactionDiplomacy(models.Model):
 
     def __str__(self):
         target_display = self.target.name if self.target else self.target_name
-        return f"{self.source.name} -> {target_display} ({self.get_relation_display()})"
+        label = _RELATION_LABELS.get(self.relation, self.relation)
+        return f"{self.source.name} -> {target_display} ({label})"
+
+_RELATION_LABELS = dict(FactionDiplomacy.Relation.choices)
 
 class FactionMembership(models.Model):
     """Through model linking Faction to IndexProfile with an affiliation level."""
-    class Affiliation(models.TextChoices):
-        LEADER = 'Leader', 'Leader'
-        HIGH_RANKING_MEMBER = 'High ranking member', 'High ranking member'
-        MEMBER = 'Member', 'Member'
-        ASSOCIATE = 'Associate', 'Associate'
-        HANGAROUND = 'Hangaround', 'Hangaround'
-        AFFILIATE = 'Affiliate', 'Affiliate'
-        SUPPORTER = 'Supporter', 'Supporter'
-        INFORMANT = 'Informant', 'Informant'
-        UNKNOWN = 'Unknown', 'Unknown'
+    class Affiliation(models.IntegerChoices):
+        # The API speaks the labels ('High ranking member', ...).
+        LEADER = 0, 'Leader'
+        HIGH_RANKING_MEMBER = 1, 'High ranking member'
+        MEMBER = 2, 'Member'
+        ASSOCIATE = 3, 'Associate'
+        HANGAROUND = 4, 'Hangaround'
+        AFFILIATE = 5, 'Affiliate'
+        SUPPORTER = 6, 'Supporter'
+        INFORMANT = 7, 'Informant'
+        UNKNOWN = 8, 'Unknown'
 
     faction = models.ForeignKey(Faction, on_delete=models.CASCADE, related_name='memberships')
     profile = models.ForeignKey(IndexProfile, on_delete=models.CASCADE, related_name='faction_memberships')
-    affiliation = models.CharField(max_length=32, choices=Affiliation.choices, default=Affiliation.ASSOCIATE)
+    affiliation = models.PositiveSmallIntegerField(choices=Affiliation.choices, default=Affiliation.ASSOCIATE)
     added_at = models.DateTimeField(db_column='added_at', default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True, db_column='updated_at')
 
     class Meta:
         unique_together = ('faction', 'profile')
-        ordering = ['-added_at']
\ No newline at end of file
+        ordering = ['-added_at']
+
+    # Re-saving an untouched row would otherwise rewrite it just to bump
+    # updated_at; a change to any other concrete column is written.
+    untracked_fields = ('updated_at',)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_tracked_fields()
+        return instance
+
+    def _tracked_attnames(self):
+        return [f.attname for f in self._meta.concrete_fields if f.name not in self.untracked_fields]
+
+    def _snapshot_tracked_fields(self):
+        loaded = self.get_deferred_fields()
+        self._loaded_values = {
+            name: getattr(self, name)
+            for name in self._tracked_attnames()
+            if name not in loaded
+        }
+
+    def save(self, *args, **kwargs):
+        loaded = getattr(self, '_loaded_values', None)
+        tracked = self._tracked_attnames()
+        # An explicit update_fields is always honoured.
+        if (
+            kwargs.get('update_fields') is None
+            and not self._state.adding
+            and loaded is not None
+            and len(loaded) == len(tracked)
+            and all(getattr(self, name) == loaded[name] for name in tracked)
+        ):
+            return
+        super().save(*args, **kwargs)
+        self._snapshot_tracked_fields()
\ No newline at end of file
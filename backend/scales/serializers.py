@@ -1,8 +1,37 @@
+from django.contrib.postgres.fields import ArrayField
+from django.db.models import Count
 from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
 from .models import Faction, Agent, Connection
-from lineage.serializers import AgentSerializer as LineageAgentSerializer
+from api.serializers import SparseFieldsetMixin
+from index.serializers import DelimitedListField
+from lineage.serializers import AgentSummarySerializer as LineageAgentSummarySerializer
 
-class FactionSerializer(serializers.ModelSerializer):
+class FactionSummarySerializer(serializers.ModelSerializer):
+    """A lightweight serializer for displaying faction names and IDs."""
+    class Meta:
+        model = Faction
+        fields = ['id', 'name']
+
+class ChoiceNameField(serializers.ChoiceField):
+    """Reads and writes an IntegerChoices column by member name (DORMANT, INFORMANT, ...)."""
+    def __init__(self, choices_class, **kwargs):
+        self.names_by_value = {member.value: member.name for member in choices_class}
+        self.values_by_name = {name: value for value, name in self.names_by_value.items()}
+        super().__init__(choices=list(self.values_by_name), **kwargs)
+
+    def to_representation(self, value):
+        return self.names_by_value.get(value, value)
+
+    def to_internal_value(self, data):
+        return self.values_by_name[super().to_internal_value(data)]
+
+class FactionSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    serializer_field_mapping = {
+        **serializers.ModelSerializer.serializer_field_mapping,
+        ArrayField: DelimitedListField,
+    }
+    threat_level = ChoiceNameField(Faction.ThreatLevel, required=False)
     member_count = serializers.IntegerField(read_only=True)
 
     class Meta:
@@ -13,7 +42,22 @@ class FactionSerializer(serializers.ModelSerializer):
             'allies', 'rivals', 'surveillance_urls'
         ]
 
-class AgentSerializer(serializers.ModelSerializer):
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Annotate member counts so listing factions doesn't COUNT per row."""
+        return queryset.annotate(annotated_member_count=Count('memberships'))
+
+class FactionListSerializer(FactionSerializer):
+    """Roster columns only; the long free-text and list fields are left to the detail view."""
+    class Meta(FactionSerializer.Meta):
+        fields = ['id', 'name', 'threat_level', 'is_active', 'picture_url', 'member_count']
+
+class AgentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    serializer_field_mapping = {
+        **serializers.ModelSerializer.serializer_field_mapping,
+        ArrayField: DelimitedListField,
+    }
+
     class Meta:
         model = Agent
         fields = [
@@ -21,14 +65,34 @@ class AgentSerializer(serializers.ModelSerializer):
             'known_locations', 'known_vehicles', 'picture_url',
             'surveillance_images', 'threat_level'
         ]
+        # Uniqueness only applies to live, non-blank aliases (see Agent.Meta.constraints).
+        extra_kwargs = {
+            'alias': {'validators': [UniqueValidator(queryset=Agent.objects.exclude(alias=''))]},
+        }
+
+class AgentSummarySerializer(serializers.ModelSerializer):
+    """A lightweight serializer for displaying an agent's alias and picture."""
+    class Meta:
+        model = Agent
+        fields = ['id', 'alias', 'picture_url']
 
 class ConnectionSerializer(serializers.ModelSerializer):
-    scales_agent = AgentSerializer(read_only=True)
-    lineage_agent = LineageAgentSerializer(read_only=True)
+    scales_agent = AgentSummarySerializer(read_only=True)
+    lineage_agent = LineageAgentSummarySerializer(read_only=True)
+    relationship = ChoiceNameField(Connection.Relationship)
 
     class Meta:
         model = Connection
         fields = [
             'id', 'scales_agent', 'lineage_agent', 'relationship',
             'note', 'created_at'
-        ]
\ No newline at end of file
+        ]
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Join both nested agents so a list of connections is a single query."""
+        return queryset.select_related('scales_agent', 'lineage_agent').only(
+            'id', 'relationship', 'note', 'created_at',
+            'scales_agent__id', 'scales_agent__alias', 'scales_agent__picture_url',
+            'lineage_agent__id', 'lineage_agent__alias', 'lineage_agent__picture_url',
+        )
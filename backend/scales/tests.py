@@ -0,0 +1,363 @@
+import importlib
+import json
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models.query import QuerySet
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from audit.models import AuditLog
+from index.models import IndexProfile
+from lineage.models import Agent as LineageAgent
+from .models import Agent, Connection, Faction, FactionHistory, FactionMembership
+
+list_fields_migration = importlib.import_module('scales.migrations.0011_list_fields')
+
+
+class ScalesAPITestCase(APITestCase):
+    """Authenticates as a Protector, the role every scales endpoint admits."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('protector', password='pw')
+        self.user.profile.role = 'PROTECTOR'
+        self.user.profile.save()
+        self.client.force_authenticate(self.user)
+        self.faction = Faction.objects.create(name='Crimson Hand')
+
+    def manage_members_url(self, faction=None):
+        return f'/api/scales/factions/{(faction or self.faction).id}/manage-members/'
+
+    def streamed_json(self, response):
+        self.assertEqual(response.status_code, 200)
+        return json.loads(b''.join(response.streaming_content))
+
+
+class ListFieldsMigrationTests(TestCase):
+    """Runs the 0011 text -> text[] conversion on the test table, after
+    turning the column back into text with the migration's reverse SQL."""
+
+    def test_splits_on_commas_semicolons_and_newlines(self):
+        faction = Faction.objects.create(name='Crimson Hand')
+        with connection.cursor() as cursor:
+            for statement in list_fields_migration._join_to_text_sql('scales_faction', 'allies'):
+                cursor.execute(statement)
+            cursor.execute(
+                'UPDATE scales_faction SET allies = %s WHERE id = %s',
+                ['Iron Court; Pale Hands,\r\nSilt Runners , ;', faction.id],
+            )
+            for statement in list_fields_migration._split_to_array_sql('scales_faction', 'allies'):
+                cursor.execute(statement)
+            cursor.execute('SELECT allies FROM scales_faction WHERE id = %s', [faction.id])
+            self.assertEqual(cursor.fetchone()[0], ['Iron Court', 'Pale Hands', 'Silt Runners'])
+
+
+class FactionMembershipSaveTests(TestCase):
+    def setUp(self):
+        faction = Faction.objects.create(name='Crimson Hand')
+        profile = IndexProfile.objects.create(full_name='Johnny Silver')
+        FactionMembership.objects.create(faction=faction, profile=profile)
+        self.membership = FactionMembership.objects.get()
+
+    def test_unchanged_save_skips_the_write(self):
+        with self.assertNumQueries(0):
+            self.membership.save()
+
+    def test_any_changed_column_is_written(self):
+        added_at = timezone.now() - timedelta(days=3)
+        self.membership.added_at = added_at
+        with self.assertNumQueries(1):
+            self.membership.save()
+        self.assertEqual(FactionMembership.objects.get().added_at, added_at)
+
+    def test_explicit_update_fields_are_honoured(self):
+        stale = timezone.now() - timedelta(days=1)
+        FactionMembership.objects.update(updated_at=stale)
+        with self.assertNumQueries(1):
+            self.membership.save(update_fields=['updated_at'])
+        self.assertGreater(FactionMembership.objects.get().updated_at, stale)
+
+
+class FactionHistorySnapshotTests(TestCase):
+    def test_snapshot_all_records_every_live_faction(self):
+        user = User.objects.create_user('protector', password='pw')
+        crimson = Faction.objects.create(name='Crimson Hand', threat_level=Faction.ThreatLevel.SEVERE)
+        iron = Faction.objects.create(name='Iron Court')
+        archived = Faction.objects.create(name='Pale Hands', deleted_at=timezone.now())
+        for name in ('Johnny Silver', 'Mara Quinn'):
+            FactionMembership.objects.create(faction=crimson, profile=IndexProfile.objects.create(full_name=name))
+
+        with self.assertNumQueries(2):
+            FactionHistory.snapshot_all(user=user)
+
+        snapshots = {
+            h.faction_id: (h.threat_level, h.member_count, h.updated_by_username)
+            for h in FactionHistory.objects.all()
+        }
+        self.assertEqual(snapshots, {
+            crimson.id: (Faction.ThreatLevel.SEVERE, 2, 'protector'),
+            iron.id: (Faction.ThreatLevel.DORMANT, 0, 'protector'),
+        })
+        self.assertNotIn(archived.id, snapshots)
+
+
+class ManageMembersCandidateSearchTests(ScalesAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.johnny = IndexProfile.objects.create(
+            full_name='Johnny Silver', aliases=['Ghost'], biography='Runs the eastern docks.',
+        )
+        self.mara = IndexProfile.objects.create(full_name='Mara Quinn', aliases=['Viper King'])
+
+    def candidates(self, query):
+        response = self.client.get(self.manage_members_url(), {'q': query})
+        self.assertEqual(response.status_code, 200)
+        return [c['full_name'] for c in response.data['candidates']]
+
+    def test_partial_alias_matches_case_insensitively(self):
+        self.assertEqual(self.candidates('gho'), ['Johnny Silver'])
+        self.assertEqual(self.candidates('VIP'), ['Mara Quinn'])
+
+    def test_every_typed_word_matches_as_a_prefix(self):
+        self.assertEqual(self.candidates('viper ki'), ['Mara Quinn'])
+        self.assertEqual(self.candidates('dock'), ['Johnny Silver'])
+
+    def test_name_substring_matches(self):
+        self.assertEqual(self.candidates('ilve'), ['Johnny Silver'])
+
+    def test_punctuation_does_not_break_the_query(self):
+        self.assertEqual(self.candidates("o'b & (x:*"), [])
+
+    def test_current_members_are_excluded(self):
+        FactionMembership.objects.create(faction=self.faction, profile=self.johnny)
+        self.assertEqual(self.candidates('gho'), [])
+
+    def test_candidates_are_returned_as_associates(self):
+        response = self.client.get(self.manage_members_url(), {'q': 'mara'})
+        self.assertEqual(response.data['candidates'], [{
+            'profile_id': self.mara.id,
+            'full_name': 'Mara Quinn',
+            'aliases': ['Viper King'],
+            'affiliation': 'Associate',
+        }])
+
+
+class ManageMembersUpdateTests(ScalesAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.johnny = IndexProfile.objects.create(full_name='Johnny Silver')
+        self.mara = IndexProfile.objects.create(full_name='Mara Quinn')
+
+    def post(self, payload):
+        # Audit entries are written on commit; run those callbacks inside the test transaction.
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(self.manage_members_url(), payload, format='json')
+
+    def audit_actions(self):
+        return list(AuditLog.objects.order_by('id').values_list('action', flat=True))
+
+    def history_counts(self):
+        return list(FactionHistory.objects.filter(faction=self.faction).values_list('member_count', flat=True))
+
+    def test_empty_payload_changes_nothing(self):
+        FactionMembership.objects.create(faction=self.faction, profile=self.johnny)
+        response = self.post({})
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual([m['full_name'] for m in response.data['members']], ['Johnny Silver'])
+        self.assertEqual(self.audit_actions(), [])
+        self.assertEqual(self.history_counts(), [])
+
+    def test_adding_members_audits_each_and_snapshots_the_count(self):
+        response = self.post({'add': [{'profile_id': self.johnny.id}, {'profile_id': self.mara.id}]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(m['full_name'], m['affiliation']) for m in response.data['members']],
+            [('Johnny Silver', 'Associate'), ('Mara Quinn', 'Associate')],
+        )
+        self.assertEqual(self.audit_actions(), [
+            "Added 'Johnny Silver' to faction 'Crimson Hand'",
+            "Added 'Mara Quinn' to faction 'Crimson Hand'",
+        ])
+        self.assertEqual(self.history_counts(), [2])
+
+    def test_adding_an_existing_member_is_a_no_op(self):
+        FactionMembership.objects.create(faction=self.faction, profile=self.johnny)
+        response = self.post({'add': [{'profile_id': self.johnny.id}]})
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(FactionMembership.objects.filter(faction=self.faction).count(), 1)
+        self.assertEqual(self.audit_actions(), [])
+        self.assertEqual(self.history_counts(), [])
+
+    def test_concurrent_add_is_reported_as_a_conflict(self):
+        bulk_create = QuerySet.bulk_create
+
+        def racing_bulk_create(queryset, objs, *args, **kwargs):
+            # Another request links Mara between the lock and the insert.
+            if queryset.model is FactionMembership:
+                FactionMembership.objects.create(faction=self.faction, profile=self.mara)
+            return bulk_create(queryset, objs, *args, **kwargs)
+
+        with mock.patch.object(QuerySet, 'bulk_create', racing_bulk_create):
+            response = self.post({'add': [{'profile_id': self.johnny.id}, {'profile_id': self.mara.id}]})
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(FactionMembership.objects.filter(faction=self.faction, profile=self.johnny).exists())
+        self.assertEqual(self.audit_actions(), [])
+        self.assertEqual(self.history_counts(), [])
+
+    def test_removing_members(self):
+        FactionMembership.objects.create(faction=self.faction, profile=self.johnny)
+        FactionMembership.objects.create(faction=self.faction, profile=self.mara)
+        response = self.post({'remove': [self.johnny.id, 'not-an-id']})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([m['full_name'] for m in response.data['members']], ['Mara Quinn'])
+        self.assertEqual(self.audit_actions(), ["Removed 1 members from faction 'Crimson Hand'"])
+        self.assertEqual(self.history_counts(), [1])
+
+    def test_affiliation_update_sets_updated_at(self):
+        membership = FactionMembership.objects.create(faction=self.faction, profile=self.johnny)
+        stale = timezone.now() - timedelta(days=1)
+        FactionMembership.objects.filter(pk=membership.pk).update(updated_at=stale)
+
+        response = self.post({'updates': [{'profile_id': self.johnny.id, 'affiliation': 'Leader'}]})
+        self.assertEqual(response.status_code, 200)
+        membership.refresh_from_db()
+        self.assertEqual(membership.affiliation, FactionMembership.Affiliation.LEADER)
+        self.assertGreater(membership.updated_at, stale)
+        self.assertEqual(self.audit_actions(), ["Updated affiliation for 'Johnny Silver' in 'Crimson Hand'"])
+        self.assertEqual(self.history_counts(), [1])
+
+    def test_unchanged_affiliation_is_not_rewritten(self):
+        membership = FactionMembership.objects.create(faction=self.faction, profile=self.johnny)
+        stale = timezone.now() - timedelta(days=1)
+        FactionMembership.objects.filter(pk=membership.pk).update(updated_at=stale)
+
+        response = self.post({'updates': [{'profile_id': self.johnny.id, 'affiliation': 'Associate'}]})
+        self.assertEqual(response.status_code, 202)
+        membership.refresh_from_db()
+        self.assertEqual(membership.updated_at, stale)
+        self.assertEqual(self.audit_actions(), [])
+
+
+class ProfileLinkTests(ScalesAPITestCase):
+    def test_link_and_unlink_snapshot_the_membership_count(self):
+        member = IndexProfile.objects.create(full_name='Johnny Silver')
+        linked = IndexProfile.objects.create(full_name='Mara Quinn')
+        FactionMembership.objects.create(faction=self.faction, profile=member)
+
+        url = f'/api/scales/factions/{self.faction.id}'
+        self.assertEqual(self.client.post(f'{url}/members/', {'profile_id': linked.id}).status_code, 200)
+        self.assertEqual(self.client.post(f'{url}/unlink-member/', {'profile_id': linked.id}).status_code, 200)
+        self.assertEqual(
+            list(FactionHistory.objects.filter(faction=self.faction).values_list('member_count', flat=True)),
+            [1, 1],
+        )
+
+
+class ChoiceNameMappingTests(ScalesAPITestCase):
+    """The choice columns are stored as ints but the API reads and writes names."""
+
+    def setUp(self):
+        super().setUp()
+        self.agent = Agent.objects.create(alias='Broker')
+        self.lineage_agent = LineageAgent.objects.create(alias='Shade')
+
+    def connections_url(self):
+        return f'/api/scales/agents/{self.agent.id}/connections/'
+
+    def test_threat_level_reads_as_name(self):
+        self.faction.threat_level = Faction.ThreatLevel.SEVERE
+        self.faction.save()
+        response = self.client.get(f'/api/scales/factions/{self.faction.id}/')
+        self.assertEqual(response.data['threat_level'], 'SEVERE')
+
+    def test_threat_level_writes_by_name(self):
+        response = self.client.patch(
+            f'/api/scales/factions/{self.faction.id}/', {'threat_level': 'CRITICAL'}, format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['threat_level'], 'CRITICAL')
+        self.faction.refresh_from_db()
+        self.assertEqual(self.faction.threat_level, Faction.ThreatLevel.CRITICAL)
+
+    def test_invalid_threat_level_is_rejected(self):
+        for value in ('HIGH', 4):
+            response = self.client.patch(
+                f'/api/scales/factions/{self.faction.id}/', {'threat_level': value}, format='json',
+            )
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('threat_level', response.data)
+        self.faction.refresh_from_db()
+        self.assertEqual(self.faction.threat_level, Faction.ThreatLevel.DORMANT)
+
+    def test_connection_relationship_writes_and_reads_by_name(self):
+        response = self.client.post(
+            self.connections_url(),
+            {'lineage_agent_id': self.lineage_agent.id, 'relationship': 'HANDLER'},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['relationship'], 'HANDLER')
+        self.assertEqual(Connection.objects.get().relationship, Connection.Relationship.HANDLER)
+
+        response = self.client.get(self.connections_url())
+        self.assertEqual([c['relationship'] for c in response.data], ['HANDLER'])
+        response = self.client.get(f'/api/lineage/agents/{self.lineage_agent.id}/connections/')
+        self.assertEqual([c['relationship'] for c in response.data], ['HANDLER'])
+
+    def test_invalid_connection_relationship_is_rejected(self):
+        for value in ('BEST_FRIEND', 5, 'Handler'):
+            response = self.client.post(
+                self.connections_url(),
+                {'lineage_agent_id': self.lineage_agent.id, 'relationship': value},
+                format='json',
+            )
+            self.assertEqual(response.status_code, 400)
+        self.assertFalse(Connection.objects.exists())
+
+    def test_affiliation_reads_and_writes_by_label(self):
+        profile = IndexProfile.objects.create(full_name='Johnny Silver')
+        response = self.client.post(
+            self.manage_members_url(),
+            {'add': [{'profile_id': profile.id, 'affiliation': 'High ranking member'}],
+             'updates': [{'profile_id': profile.id, 'affiliation': 'High ranking member'}]},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([m['affiliation'] for m in response.data['members']], ['High ranking member'])
+        self.assertIn('High ranking member', response.data['affiliation_options'])
+        self.assertEqual(
+            FactionMembership.objects.get().affiliation, FactionMembership.Affiliation.HIGH_RANKING_MEMBER,
+        )
+
+    def test_history_and_timeline_emit_threat_names(self):
+        FactionHistory.objects.create(
+            faction=self.faction, threat_level=Faction.ThreatLevel.ELEVATED, member_count=3, updated_by=self.user,
+        )
+        FactionHistory.objects.create(faction=self.faction, threat_level=None, member_count=0)
+
+        history = self.streamed_json(self.client.get(f'/api/scales/factions/{self.faction.id}/history/'))
+        self.assertEqual([h['threat_index'] for h in history], ['ELEVATED', None])
+
+        timeline = self.streamed_json(self.client.get(f'/api/scales/factions/{self.faction.id}/timeline/'))
+        self.assertEqual(
+            sorted(item['text'] for item in timeline),
+            ['Threat set to ELEVATED, Members 3', 'Threat set to None, Members 0'],
+        )
+
+    def test_network_emits_threat_and_relationship_names(self):
+        self.faction.threat_level = Faction.ThreatLevel.NOMINAL
+        self.faction.save()
+        Connection.objects.create(
+            scales_agent=self.agent, lineage_agent=self.lineage_agent, relationship=Connection.Relationship.FAMILY_TIE,
+        )
+        response = self.client.get('/api/scales/network/')
+        self.assertEqual(response.status_code, 200)
+        nodes = {node['id']: node for node in response.data['nodes']}
+        self.assertEqual(nodes[f'F-{self.faction.id}']['threat'], 'NOMINAL')
+        self.assertEqual(
+            [link['relationship'] for link in response.data['links'] if link['kind'] == 'CONNECTION'],
+            ['FAMILY_TIE'],
+        )
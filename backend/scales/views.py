@@ -1,22 +1,51 @@
-import re
+from functools import partial
 
 from django.utils import timezone
-from django.db import transaction
-from django.db.models import Q, Prefetch
+from django.db import IntegrityError, transaction
+from django.contrib.contenttypes.models import ContentType
+from django.http import StreamingHttpResponse
+from django.db.models import Exists, F, IntegerField, JSONField, OuterRef, Value
+from django.db.models.functions import Coalesce
 from rest_framework import viewsets, status, generics
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.filters import SearchFilter
 from rest_framework.exceptions import PermissionDenied
+from rest_framework.utils.encoders import JSONEncoder
 import uuid
 
 from .models import Faction, Agent, Connection, FactionHistory, FactionMembership
-from index.models import IndexProfile
+from index.models import IndexProfile, IndexAffiliation
 from audit.models import AuditLog
-from .serializers import FactionSerializer, AgentSerializer, ConnectionSerializer
+from .serializers import FactionSerializer, FactionListSerializer, AgentSerializer, ConnectionSerializer
 from api.permissions import get_user_role, IsProtectorOrHeir, IsHQProtectorOrHeir
-from audit.utils import log_action
+from audit.utils import log_action, log_actions_bulk
+
+# Memberships store the affiliation as a small int; the API speaks its label.
+AFFILIATION_LABELS = dict(FactionMembership.Affiliation.choices)
+AFFILIATION_BY_LABEL = {label: value for value, label in AFFILIATION_LABELS.items()}
+AFFILIATION_OPTIONS = tuple(AFFILIATION_BY_LABEL)
+
+# Connections are posted and graphed by relationship name.
+RELATIONSHIP_BY_NAME = {member.name: member.value for member in Connection.Relationship}
+RELATIONSHIP_NAMES = {value: name for name, value in RELATIONSHIP_BY_NAME.items()}
+
+
+def _json_array_response(items):
+    """Stream an iterable of dicts as a JSON array, encoding one item at a time."""
+    encoder = JSONEncoder()
+
+    def chunks():
+        yield '['
+        for index, item in enumerate(items):
+            if index:
+                yield ','
+            yield encoder.encode(item)
+        yield ']'
+
+    return StreamingHttpResponse(chunks(), content_type='application/json')
+
 
 class FactionViewSet(viewsets.ModelViewSet):
     """
@@ -28,7 +57,32 @@ class FactionViewSet(viewsets.ModelViewSet):
     filter_backends = [SearchFilter]
     search_fields = ['name', 'description']
 
-    alias_splitter = re.compile(r'[,\n\r;]+')
+    # Columns the list serializer never reads; skipped unless ?full=1
+    list_deferred_fields = (
+        'description', 'strengths', 'weaknesses', 'allies', 'rivals',
+        'surveillance_urls',
+    )
+
+    # Membership columns manage-members reads; the joined profile contributes
+    # only what _serialize_membership and the audit lines print.
+    membership_fields = (
+        'faction_id', 'profile', 'affiliation', 'updated_at',
+        'profile__full_name', 'profile__aliases',
+    )
+
+    # Actions that read member_count; its GROUP BY is left off every other lookup.
+    member_count_actions = ('list', 'retrieve', 'add_member', 'unlink_member')
+
+    # Newest history snapshots and audit entries returned by timeline.
+    timeline_limit = 400
+
+    def _is_summary_list(self):
+        return self.action == 'list' and self.request.query_params.get('full') != '1'
+
+    def get_serializer_class(self):
+        if self._is_summary_list():
+            return FactionListSerializer
+        return super().get_serializer_class()
 
     def get_object(self):
         queryset = self.filter_queryset(self.get_queryset())
@@ -50,60 +104,52 @@ class FactionViewSet(viewsets.ModelViewSet):
             return False
 
     def _affiliation_choices(self):
-        return [choice.value for choice in FactionMembership.Affiliation]
-
-    def _normalise_affiliation(self, value, options):
-        value = (value or '').strip()
-        if value in options:
-            return value
-        if FactionMembership.Affiliation.ASSOCIATE in options:
-            return FactionMembership.Affiliation.ASSOCIATE
-        return options[0] if options else FactionMembership.Affiliation.ASSOCIATE
-
-    def _log_faction_history(self, faction, user):
-        """Helper to create a FactionHistory entry after membership changes."""
+        return list(AFFILIATION_OPTIONS)
+
+    def _normalise_affiliation(self, value):
+        """Map a posted affiliation label to its stored value, defaulting to Associate."""
+        return AFFILIATION_BY_LABEL.get((value or '').strip(), FactionMembership.Affiliation.ASSOCIATE)
+
+    def _log_faction_history(self, faction, user, member_count):
+        """Helper to create a FactionHistory entry after membership changes.
+
+        member_count is the faction's FactionMembership count, as in
+        FactionHistory.snapshot_all; callers pass one they already hold.
+        """
+        FactionHistory.objects.create(
+            faction=faction,
+            threat_level=faction.threat_level,
+            member_count=member_count,
+            updated_by=user,
+        )
+
+    def _lookup_profile(self, profile_id):
+        """Return ``(id, full_name)`` for a live IndexProfile, or None if the id does not resolve."""
         try:
-            # Use the latest member count from the database for accuracy.
-            member_count = FactionMembership.objects.filter(faction=faction).count()
-            FactionHistory.objects.create(
-                faction=faction, 
-                threat_level=faction.threat_level,
-                member_count=member_count,
-                updated_by=user,
-            )
-        except Exception:
-            # It's often better to log this error than to pass silently.
-            pass
-
-    def _split_aliases(self, raw):
-        if not raw:
-            return []
-        if isinstance(raw, (list, tuple)):
-            return [str(part).strip() for part in raw if str(part).strip()]
-        return [
-            part.strip()
-            for part in self.alias_splitter.split(str(raw))
-            if part.strip()
-        ]
+            profile_id = int(profile_id)
+        except (TypeError, ValueError):
+            return None
+        return IndexProfile.objects.filter(id=profile_id).values_list('id', 'full_name').first()
 
-    def _serialize_membership(self, membership, options):
+    def _serialize_membership(self, membership):
         profile = membership.profile
         return {
             'profile_id': profile.id,
             'full_name': profile.full_name,
-            'aliases': self._split_aliases(profile.aliases),
-            'affiliation': self._normalise_affiliation(membership.affiliation, options),
+            'aliases': profile.aliases,
+            'affiliation': AFFILIATION_LABELS[membership.affiliation],
         }
 
-    def _get_serialized_members(self, faction, affiliation_options):
+    def _get_serialized_members(self, faction):
         """Helper to fetch and serialize the current members of a faction."""
         memberships = (
             FactionMembership.objects.filter(faction=faction)
             .select_related('profile')
+            .only(*self.membership_fields)
             .order_by('profile__full_name')
         )
         return [
-            self._serialize_membership(membership, affiliation_options)
+            self._serialize_membership(membership)
             for membership in memberships
             if membership.profile_id and membership.profile is not None
         ]
@@ -117,16 +163,16 @@ class FactionViewSet(viewsets.ModelViewSet):
         return super().get_permissions()
 
     def get_queryset(self):
-        role = get_user_role(self.request.user)
-        member_prefetch = Prefetch(
-            'memberships',
-            queryset=FactionMembership.objects.select_related('profile'),
-            to_attr='prefetched_memberships',
-        )
-        prefetch = ['diplomacy_outgoing__target', member_prefetch]
-        if role in ['PROTECTOR', 'HQ']:
-            return Faction.all_objects.prefetch_related(*prefetch).all().order_by('name')
-        return Faction.objects.prefetch_related(*prefetch).all().order_by('name')
+        qs = Faction.all_objects.all()
+        # Archived rows stay visible to PROTECTOR/HQ; everyone else sees live rows only.
+        if get_user_role(self.request.user) not in ['PROTECTOR', 'HQ']:
+            qs = qs.filter(deleted_at__isnull=True)
+        if self._is_summary_list():
+            qs = qs.defer(*self.list_deferred_fields)
+        qs = self.get_serializer_class().sparse_queryset(qs, self.request)
+        if self.action in self.member_count_actions:
+            qs = FactionSerializer.setup_eager_loading(qs)
+        return qs.order_by('name')
 
     def perform_create(self, serializer):
         faction = serializer.save()
@@ -134,9 +180,7 @@ class FactionViewSet(viewsets.ModelViewSet):
 
     def perform_update(self, serializer):
         # Capture previous values for change detection
-        prev = serializer.instance
-        prev_threat = prev.threat_level
-        prev_members = prev.member_count if hasattr(prev, 'member_count') else None
+        prev_threat = serializer.instance.threat_level
         faction = serializer.save()
         log_action(self.request.user, f"Updated faction '{faction.name}'", target=faction)
         # Log history if key indicators changed
@@ -159,7 +203,7 @@ class FactionViewSet(viewsets.ModelViewSet):
             instance.delete()  # Hard delete
         elif role == 'HEIR':
             instance.deleted_at = timezone.now()
-            instance.save()
+            Faction.all_objects.filter(pk=instance.pk).update(deleted_at=instance.deleted_at)
             log_action(self.request.user, f"Archived faction '{faction_name}'", target=instance)
         else:  # Overlooker and any other role
             log_action(self.request.user, f"Denied attempt to delete faction '{faction_name}'", target=instance)
@@ -172,19 +216,18 @@ class FactionViewSet(viewsets.ModelViewSet):
         Body: { profile_id: int }
         """
         faction = self.get_object()
-        profile_id = request.data.get('profile_id')
-        try:
-            from index.models import IndexProfile, IndexAffiliation
-            profile = IndexProfile.objects.get(id=profile_id)
-            level = request.data.get('level') or None
-            # create/update through model to store level
-            obj, _ = IndexAffiliation.objects.update_or_create(profile=profile, faction=faction, defaults={'level': level})
-            log_action(request.user, f"Linked profile '{profile.full_name}' to faction '{faction.name}'", target=faction)
-            # Optional: history snapshot for member count using index profiles length
-            self._log_faction_history(faction, request.user)
-            return Response({'status': 'linked'}, status=status.HTTP_200_OK)
-        except Exception:
+        profile = self._lookup_profile(request.data.get('profile_id'))
+        if profile is None:
             return Response({'error': 'Profile not found'}, status=status.HTTP_404_NOT_FOUND)
+        profile_id, profile_name = profile
+        level = request.data.get('level') or None
+        # create/update through model to store level
+        IndexAffiliation.objects.update_or_create(profile_id=profile_id, faction=faction, defaults={'level': level})
+        log_action(request.user, f"Linked profile '{profile_name}' to faction '{faction.name}'", target=faction)
+        # IndexAffiliation links leave the membership count unchanged; snapshot the
+        # count annotated onto the faction by get_queryset.
+        self._log_faction_history(faction, request.user, faction.member_count)
+        return Response({'status': 'linked'}, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=['post'], url_path='unlink-member', permission_classes=[IsAuthenticated])
     def unlink_member(self, request, pk=None):
@@ -193,16 +236,14 @@ class FactionViewSet(viewsets.ModelViewSet):
         Body: { profile_id: int }
         """
         faction = self.get_object()
-        profile_id = request.data.get('profile_id')
-        try:
-            from index.models import IndexProfile, IndexAffiliation
-            profile = IndexProfile.objects.get(id=profile_id)
-            IndexAffiliation.objects.filter(profile=profile, faction=faction).delete()
-            log_action(request.user, f"Unlinked profile '{profile.full_name}' from faction '{faction.name}'", target=faction)
-            self._log_faction_history(faction, request.user)
-            return Response({'status': 'unlinked'}, status=status.HTTP_200_OK)
-        except Exception:
+        profile = self._lookup_profile(request.data.get('profile_id'))
+        if profile is None:
             return Response({'error': 'Profile not found'}, status=status.HTTP_404_NOT_FOUND)
+        profile_id, profile_name = profile
+        IndexAffiliation.objects.filter(profile_id=profile_id, faction=faction).delete()
+        log_action(request.user, f"Unlinked profile '{profile_name}' from faction '{faction.name}'", target=faction)
+        self._log_faction_history(faction, request.user, faction.member_count)
+        return Response({'status': 'unlinked'}, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=['get', 'post'], url_path='manage-members', permission_classes=[IsHQProtectorOrHeir])
     def manage_members(self, request, pk=None):
@@ -211,22 +252,19 @@ class FactionViewSet(viewsets.ModelViewSet):
         query = (request.query_params.get('q') or '').strip()
 
         if request.method.lower() == 'get' and query:
-            existing_ids = set(
-                FactionMembership.objects.filter(faction=faction).values_list('profile_id', flat=True)
-            )
+            is_member = FactionMembership.objects.filter(faction=faction, profile_id=OuterRef('pk'))
             search = (
-                IndexProfile.objects.filter(
-                    Q(full_name__icontains=query) | Q(aliases__icontains=query)
-                )
-                .exclude(id__in=existing_ids)
+                IndexProfile.objects.filter(IndexProfile.search_filter(query))
+                .filter(~Exists(is_member))
+                .only('id', 'full_name', 'aliases')
                 .order_by('full_name')[:20]
             )
             candidates = [
                 {
                     'profile_id': profile.id,
                     'full_name': profile.full_name,
-                    'aliases': self._split_aliases(profile.aliases),
-                    'affiliation': self._normalise_affiliation(None, affiliation_options),
+                    'aliases': profile.aliases,
+                    'affiliation': FactionMembership.Affiliation.ASSOCIATE.label,
                 }
                 for profile in search
             ]
@@ -236,7 +274,7 @@ class FactionViewSet(viewsets.ModelViewSet):
             })
 
         if request.method.lower() == 'get':
-            members = self._get_serialized_members(faction, affiliation_options)
+            members = self._get_serialized_members(faction)
             return Response({
                 'affiliation_options': affiliation_options,
                 'members': members,
@@ -259,18 +297,33 @@ class FactionViewSet(viewsets.ModelViewSet):
 
         add_ids = get_ids_from_payload(add_payload)
         remove_ids = [int(pid) for pid in remove_payload if str(pid).isdigit()]
+        # Only memberships the payload names are locked; the rest of the faction stays writable.
+        touched_ids = set(add_ids) | set(get_ids_from_payload(updates_payload)) | set(remove_ids)
+        if not touched_ids:
+            # Nothing to apply (e.g. an empty autosave); skip the transaction entirely.
+            return Response({
+                'affiliation_options': affiliation_options,
+                'members': self._get_serialized_members(faction),
+            }, status=status.HTTP_202_ACCEPTED)
 
         made_changes = False
+        audit_entries = []
         with transaction.atomic():
             memberships = {
                 m.profile_id: m
-                for m in FactionMembership.objects.select_for_update().filter(faction=faction)
+                for m in (
+                    FactionMembership.objects.select_for_update(of=('self',))
+                    .select_related('profile')
+                    .only(*self.membership_fields)
+                    .filter(faction=faction, profile_id__in=touched_ids)
+                )
             }
 
             if add_ids:
                 profiles = {
                     p.id: p for p in IndexProfile.objects.filter(id__in=add_ids)
                 }
+                new_rows = {}
                 for item in add_payload:
                     try:
                         profile_id = int(item.get('profile_id'))
@@ -278,21 +331,38 @@ class FactionViewSet(viewsets.ModelViewSet):
                         continue
                     profile = profiles.get(profile_id)
                     if profile:
-                        desired_aff = self._normalise_affiliation(item.get('affiliation'), affiliation_options)
+                        desired_aff = self._normalise_affiliation(item.get('affiliation'))
                         # If the member is not already in the faction, create the membership.
-                        if profile_id not in memberships:
-                            membership = FactionMembership.objects.create(
+                        if profile_id not in memberships and profile_id not in new_rows:
+                            new_rows[profile_id] = FactionMembership(
                                 faction=faction,
                                 profile=profile,
                                 affiliation=desired_aff,
                             )
-                            memberships[profile_id] = membership
-                            made_changes = True
-                            log_action(request.user, f"Added '{profile.full_name}' to faction '{faction.name}'", target=faction)
                         # Note: The 'updates' loop below will handle affiliation changes for both
                         # existing members and newly added members if their affiliation was
                         # changed on the frontend after being added.
+                if new_rows:
+                    # The touched memberships are locked, so every pair in new_rows was
+                    # absent; a plain insert returns the rows with their pks set.
+                    try:
+                        with transaction.atomic():
+                            FactionMembership.objects.bulk_create(new_rows.values(), batch_size=500)
+                    except IntegrityError:
+                        # Another request added one of these profiles after the lock was taken.
+                        return Response(
+                            {'error': 'Faction members changed concurrently; reload and retry.'},
+                            status=status.HTTP_409_CONFLICT,
+                        )
+                    memberships.update(new_rows)
+                    audit_entries.extend(
+                        (f"Added '{membership.profile.full_name}' to faction '{faction.name}'", faction, None)
+                        for membership in new_rows.values()
+                    )
+                    made_changes = True
 
+            to_update = []
+            now = timezone.now()
             for item in updates_payload:
                 try:
                     profile_id = int(item.get('profile_id'))
@@ -301,12 +371,16 @@ class FactionViewSet(viewsets.ModelViewSet):
                 membership = memberships.get(profile_id)
                 if not membership:
                     continue
-                desired_aff = self._normalise_affiliation(item.get('affiliation'), affiliation_options)
+                desired_aff = self._normalise_affiliation(item.get('affiliation'))
                 if membership.affiliation != desired_aff:
                     membership.affiliation = desired_aff
-                    membership.save(update_fields=['affiliation', 'updated_at'])
-                    made_changes = True
-                    log_action(request.user, f"Updated affiliation for '{membership.profile.full_name}' in '{faction.name}'", target=faction)
+                    # bulk_update bypasses save(), so auto_now has to be applied here.
+                    membership.updated_at = now
+                    to_update.append(membership)
+                    audit_entries.append((f"Updated affiliation for '{membership.profile.full_name}' in '{faction.name}'", faction, None))
+            if to_update:
+                FactionMembership.objects.bulk_update(to_update, ['affiliation', 'updated_at'], batch_size=500)
+                made_changes = True
 
             if remove_ids:
                 deleted, _ = FactionMembership.objects.filter(
@@ -315,15 +389,17 @@ class FactionViewSet(viewsets.ModelViewSet):
                 ).delete()
                 if deleted:
                     made_changes = True
-                    for pid in remove_ids:
-                        memberships.pop(pid, None)
-                    log_action(request.user, f"Removed {deleted} members from faction '{faction.name}'", target=faction)
+                    audit_entries.append((f"Removed {deleted} members from faction '{faction.name}'", faction, None))
 
-        if made_changes:
-            # Individual actions are now logged above for better audit granularity.
-            self._log_faction_history(faction, request.user)
+            if audit_entries:
+                # Written once the membership locks are released; skipped if the changes roll back.
+                transaction.on_commit(partial(log_actions_bulk, request.user, audit_entries))
+
+            # Read inside the transaction so the snapshot count matches the rows just written.
+            members = self._get_serialized_members(faction)
+            if made_changes:
+                self._log_faction_history(faction, request.user, member_count=len(members))
 
-        members = self._get_serialized_members(faction, affiliation_options)
         status_code = status.HTTP_200_OK if made_changes else status.HTTP_202_ACCEPTED
         return Response({
             'affiliation_options': affiliation_options,
@@ -333,81 +409,101 @@ class FactionViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'], url_path='history', permission_classes=[IsAuthenticated])
     def history(self, request, pk=None):
         faction = self.get_object()
-        qs = FactionHistory.objects.filter(faction=faction).order_by('timestamp')
-        data = [
+        rows = FactionHistory.objects.filter(faction=faction).order_by('timestamp').values_list(
+            'timestamp', 'threat_level', 'member_count',
+        ).iterator(chunk_size=2000)
+        return _json_array_response(
             {
-                'timestamp': h.timestamp,
-                'threat_index': h.threat_index,
-                'member_count': h.member_count,
+                'timestamp': timestamp,
+                # Keeps the payload key clients already read; the value is the level name.
+                'threat_index': Faction.ThreatLevel(threat).name if threat is not None else None,
+                'member_count': member_count,
             }
-            for h in qs
-        ]
-        return Response(data)
+            for timestamp, threat, member_count in rows
+        )
 
     @action(detail=False, methods=['get'], url_path='network', permission_classes=[IsAuthenticated])
     def network(self, request):
         """Return a simple node-link graph of factions, their members, and lineage connections."""
-        factions = list(Faction.objects.prefetch_related('memberships__profile').all())
-        scales_agents = list(Agent.objects.all())
-        conns = list(Connection.objects.select_related('scales_agent', 'lineage_agent').all())
-
-        nodes = []
+        # Plain values() rows per edge type; nodes are keyed by id so the
+        # first label seen for a shared S- node wins.
+        nodes = {}
         links = []
-        seen = set()
-
-        for f in factions:
-            nid = f"F-{f.id}"
-            if nid not in seen:
-                nodes.append({ 'id': nid, 'type': 'FACTION', 'label': f.name, 'threat': f.threat_index })
-                seen.add(nid)
-            for membership in f.memberships.all():
-                sid = f"S-{membership.profile_id}"
-                if sid not in seen:
-                    nodes.append({ 'id': sid, 'type': 'SCALES_AGENT', 'label': membership.profile.full_name })
-                    seen.add(sid)
-                links.append({ 'source': sid, 'target': nid, 'kind': 'MEMBER_OF' })
-
-        for c in conns:
-            sid = f"S-{c.scales_agent_id}"
-            lid = f"L-{c.lineage_agent_id}"
-            if sid not in seen:
-                nodes.append({ 'id': sid, 'type': 'SCALES_AGENT', 'label': c.scales_agent.alias })
-                seen.add(sid)
-            if lid not in seen:
-                nodes.append({ 'id': lid, 'type': 'LINEAGE_AGENT', 'label': c.lineage_agent.alias })
-                seen.add(lid)
-            links.append({ 'source': sid, 'target': lid, 'kind': 'CONNECTION', 'relationship': c.relationship })
-
-        return Response({ 'nodes': nodes, 'links': links })
+
+        for f in Faction.objects.values('id', 'name', 'threat_level'):
+            nid = f"F-{f['id']}"
+            nodes[nid] = { 'id': nid, 'type': 'FACTION', 'label': f['name'], 'threat': Faction.ThreatLevel(f['threat_level']).name }
+
+        memberships = FactionMembership.objects.filter(faction__deleted_at__isnull=True).values_list(
+            'faction_id', 'profile_id', 'profile__full_name',
+        )
+        for faction_id, profile_id, full_name in memberships:
+            sid = f"S-{profile_id}"
+            nodes.setdefault(sid, { 'id': sid, 'type': 'SCALES_AGENT', 'label': full_name })
+            links.append({ 'source': sid, 'target': f"F-{faction_id}", 'kind': 'MEMBER_OF' })
+
+        conns = Connection.objects.values_list(
+            'scales_agent_id', 'scales_agent__alias', 'lineage_agent_id', 'lineage_agent__alias', 'relationship',
+        )
+        for scales_agent_id, scales_alias, lineage_agent_id, lineage_alias, relationship in conns:
+            sid = f"S-{scales_agent_id}"
+            lid = f"L-{lineage_agent_id}"
+            nodes.setdefault(sid, { 'id': sid, 'type': 'SCALES_AGENT', 'label': scales_alias })
+            nodes.setdefault(lid, { 'id': lid, 'type': 'LINEAGE_AGENT', 'label': lineage_alias })
+            links.append({ 'source': sid, 'target': lid, 'kind': 'CONNECTION', 'relationship': RELATIONSHIP_NAMES[relationship] })
+
+        return Response({ 'nodes': list(nodes.values()), 'links': links })
 
     @action(detail=True, methods=['get'], url_path='timeline', permission_classes=[IsAuthenticated])
     def timeline(self, request, pk=None):
         """Aggregate faction timeline: history snapshots + audit references."""
         faction = self.get_object()
-        items = []
-        # Faction history points
-        for h in FactionHistory.objects.filter(faction=faction).order_by('-timestamp'):
-            items.append({
-                'timestamp': h.timestamp,
-                'source': 'HISTORY', 
+        # One UNION ordered and capped in SQL; both branches share this column layout.
+        columns = ('timestamp', 'source', 'text', 'role', 'username', 'details', 'threat', 'members')
+        history = FactionHistory.objects.filter(faction=faction).order_by().annotate(
+            source=Value('HISTORY'),
+            text=Value(''),
+            role=Value('System'),
+            username=F('updated_by_username'),
+            details=Value(None, output_field=JSONField()),
+            threat=F('threat_level'),
+            members=F('member_count'),
+        ).values_list(*columns)
+        audit = AuditLog.objects.filter(
+            content_type=ContentType.objects.get_for_model(Faction),
+            object_id=faction.id,
+        ).order_by().annotate(
+            source=Value('AUDIT'),
+            text=F('action'),
+            username=Coalesce(F('user__username'), Value('')),
+            threat=Value(None, output_field=IntegerField()),
+            members=Value(None, output_field=IntegerField()),
+        ).values_list(*columns)
+
+        rows = history.union(audit, all=True).order_by('-timestamp')[:self.timeline_limit].iterator()
+        return _json_array_response(self._timeline_item(*row) for row in rows)
+
+    @staticmethod
+    def _timeline_item(timestamp, source, text, role, username, details, threat, members):
+        if source == 'HISTORY':
+            threat_name = Faction.ThreatLevel(threat).name if threat is not None else None
+            return {
+                'timestamp': timestamp,
+                'source': 'HISTORY',
                 'type': 'FACTION_METRICS',
-                'text': f"Threat set to {h.threat_level}, Members {h.member_count}",
-                'role': 'System',
-                'user': '',
-            })
-        # Audit logs linked to this faction
-        for log in AuditLog.objects.filter(content_type__model='faction', object_id=faction.id).order_by('-timestamp')[:200]:
-            items.append({
-                'timestamp': log.timestamp,
-                'source': 'AUDIT',
-                'type': 'ACTION',
-                'text': log.action,
-                'role': log.role or '',
-                'user': getattr(log.user, 'username', '') or '',
-                'details': log.details or None,
-            })
-        items.sort(key=lambda x: x['timestamp'], reverse=True)
-        return Response(items)
+                'text': f"Threat set to {threat_name}, Members {members}",
+                'role': role,
+                'user': username,
+            }
+        return {
+            'timestamp': timestamp,
+            'source': 'AUDIT',
+            'type': 'ACTION',
+            'text': text,
+            'role': role or '',
+            'user': username,
+            'details': details or None,
+        }
 
 class AgentViewSet(viewsets.ModelViewSet):
     """
@@ -416,6 +512,12 @@ class AgentViewSet(viewsets.ModelViewSet):
     serializer_class = AgentSerializer
     permission_classes = [IsAuthenticated]
 
+    # Columns the list leaves out unless ?full=1 or named in ?fields=
+    list_deferred_fields = (
+        'strengths', 'weaknesses', 'known_locations', 'known_vehicles',
+        'surveillance_images',
+    )
+
     def get_permissions(self):
         if self.action in ['list', 'retrieve', 'connections'] and self.request.method.lower() == 'get':
             self.permission_classes = [IsAuthenticated]
@@ -424,10 +526,22 @@ class AgentViewSet(viewsets.ModelViewSet):
         return super().get_permissions()
 
     def get_queryset(self):
-        role = get_user_role(self.request.user)
-        if role in ['PROTECTOR', 'HQ']:
-            return Agent.all_objects.all().order_by('alias')
-        return Agent.objects.all().order_by('alias')
+        qs = Agent.all_objects.all()
+        # Archived rows stay visible to PROTECTOR/HQ; everyone else sees live rows only.
+        if get_user_role(self.request.user) not in ['PROTECTOR', 'HQ']:
+            qs = qs.filter(deleted_at__isnull=True)
+        return AgentSerializer.sparse_queryset(qs, self.request).order_by('alias')
+
+    def list(self, request, *args, **kwargs):
+        # Every AgentSerializer field is a plain column, so rows can be
+        # returned straight from values() without per-row serializer work.
+        fields = AgentSerializer.requested_fields(request)
+        if not fields:
+            fields = AgentSerializer.Meta.fields
+            if request.query_params.get('full') != '1':
+                fields = [name for name in fields if name not in self.list_deferred_fields]
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(list(queryset.values(*fields)))
 
     def perform_create(self, serializer):
         agent = serializer.save()
@@ -446,7 +560,7 @@ class AgentViewSet(viewsets.ModelViewSet):
             instance.delete()
         elif role == 'HEIR':
             instance.deleted_at = timezone.now()
-            instance.save()
+            Agent.all_objects.filter(pk=instance.pk).update(deleted_at=instance.deleted_at)
             log_action(self.request.user, f"Archived external agent '{agent_alias}'", target=instance)
         else:
             log_action(self.request.user, f"Denied attempt to delete external agent '{agent_alias}'", target=instance)
@@ -461,7 +575,7 @@ class AgentViewSet(viewsets.ModelViewSet):
         """
         scales_agent = self.get_object()
         if request.method.lower() == 'get':
-            qs = Connection.objects.filter(scales_agent=scales_agent).select_related('lineage_agent')
+            qs = ConnectionSerializer.setup_eager_loading(Connection.objects.filter(scales_agent=scales_agent))
             return Response(ConnectionSerializer(qs, many=True).data)
 
         # POST create
@@ -473,21 +587,22 @@ class AgentViewSet(viewsets.ModelViewSet):
         note = request.data.get('note', '')
         if not lineage_agent_id or not relationship:
             return Response({'error': 'lineage_agent_id and relationship are required.'}, status=status.HTTP_400_BAD_REQUEST)
+        relationship_value = RELATIONSHIP_BY_NAME.get(relationship)
+        if relationship_value is None:
+            return Response({'error': 'Invalid relationship value.'}, status=status.HTTP_400_BAD_REQUEST)
         from lineage.models import Agent as LineageAgent
         try:
             lineage_agent = LineageAgent.objects.get(pk=lineage_agent_id)
         except LineageAgent.DoesNotExist:
             return Response({'error': 'Lineage agent not found.'}, status=status.HTTP_404_NOT_FOUND)
-        if relationship not in dict(Connection.Relationship.choices):
-            return Response({'error': 'Invalid relationship value.'}, status=status.HTTP_400_BAD_REQUEST)
         conn, created = Connection.objects.get_or_create(
             scales_agent=scales_agent,
             lineage_agent=lineage_agent,
-            defaults={'relationship': relationship, 'note': note}
+            defaults={'relationship': relationship_value, 'note': note}
         )
         if not created:
             # Update relationship/note if already exists
-            conn.relationship = relationship
+            conn.relationship = relationship_value
             conn.note = note
             conn.save(update_fields=['relationship', 'note'])
         log_action(request.user, f"Linked scales agent '{scales_agent.alias}' to lineage agent '{lineage_agent.alias}' as {relationship}", target=scales_agent)
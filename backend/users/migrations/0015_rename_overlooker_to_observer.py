@@ -1,17 +1,6 @@
 from django.db import migrations
 
 
-def forwards(apps, schema_editor):
-    UserProfile = apps.get_model('users', 'UserProfile')
-    # Rename any legacy OVERLOOKER role values to OBSERVER
-    UserProfile.objects.filter(role='OVERLOOKER').update(role='OBSERVER')
-
-
-def backwards(apps, schema_editor):
-    # No-op backwards; retain OBSERVER
-    pass
-
-
 class Migration(migrations.Migration):
 
     dependencies = [
@@ -19,6 +8,10 @@ class Migration(migrations.Migration):
     ]
 
     operations = [
-        migrations.RunPython(forwards, backwards),
+        # Rename any legacy OVERLOOKER role values to OBSERVER.
+        # No-op backwards; retain OBSERVER.
+        migrations.RunSQL(
+            sql="UPDATE users_userprofile SET role = 'OBSERVER' WHERE role = 'OVERLOOKER';",
+            reverse_sql=migrations.RunSQL.noop,
+        )
     ]
-
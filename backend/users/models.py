@@ -1,9 +1,14 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.utils import timezone
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
+from api.permissions import clear_cached_role
+
+LEADERSHIP_IDS_CACHE_KEY = 'leadership_user_ids'
+
 class UserProfile(models.Model):
     class Role(models.TextChoices):
         PROTECTOR = 'PROTECTOR', 'Protector'
@@ -20,9 +25,28 @@ class UserProfile(models.Model):
         default=Role.OBSERVER
     )
 
+    # Roles whose holders receive leadership notifications (see leadership_user_ids).
+    LEADERSHIP_ROLES = frozenset({Role.PROTECTOR, Role.HEIR})
+
     def __str__(self):
         return f'{self.user.username} - {self.get_role_display()}'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_role = instance.__dict__.get('role')
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # User saves (e.g. each login's last_login) re-save the profile, so only a
+        # move into or out of leadership drops the cached recipient list.
+        previous = getattr(self, '_loaded_role', None)
+        if previous != self.role and {previous, self.role} & self.LEADERSHIP_ROLES:
+            clear_leadership_user_ids()
+        self._loaded_role = self.role
+        _clear_cached_role(self)
+
 class Mantle(models.Model):
     """Represents the temporary delegation of Protector authority."""
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='mantle')
@@ -31,6 +55,11 @@ class Mantle(models.Model):
     end_time = models.DateTimeField()
     is_active = models.BooleanField(default=True)
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # A granted or revoked mantle changes the holder's effective role.
+        _clear_cached_role(self)
+
     def is_currently_active(self):
         """Check if the mantle is currently active."""
         return self.is_active and self.end_time > timezone.now()
@@ -77,3 +106,30 @@ def create_user_profile(sender, instance, created, **kwargs):
 @receiver(post_save, sender=User)
 def save_user_profile(sender, instance, **kwargs):
     instance.profile.save()
+
+def _clear_cached_role(instance):
+    # Only a user already loaded alongside the profile/mantle can hold a memoized role.
+    if instance._meta.get_field('user').is_cached(instance):
+        clear_cached_role(instance.user)
+
+def leadership_user_ids():
+    """Ids of Protector/Heir users, the recipients of leadership notifications.
+
+    Roles change rarely, so the list is cached when Redis is configured (see
+    CACHES) and dropped whenever a profile saved through the ORM enters or
+    leaves a leadership role, or is deleted. QuerySet.update() and raw SQL
+    skip save(); code changing roles that way must call
+    clear_leadership_user_ids(), and the 300s timeout bounds anything missed.
+    """
+    ids = cache.get(LEADERSHIP_IDS_CACHE_KEY)
+    if ids is None:
+        ids = list(
+            UserProfile.objects.filter(role__in=[UserProfile.Role.PROTECTOR, UserProfile.Role.HEIR])
+            .values_list('user_id', flat=True)
+        )
+        cache.set(LEADERSHIP_IDS_CACHE_KEY, ids, 300)
+    return ids
+
+@receiver(post_delete, sender=UserProfile)
+def clear_leadership_user_ids(sender=None, **kwargs):
+    cache.delete(LEADERSHIP_IDS_CACHE_KEY)
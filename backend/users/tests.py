@@ -0,0 +1,74 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from api.permissions import get_user_role
+from .models import Mantle, UserProfile, leadership_user_ids
+
+# Stands in for Redis: the default test cache is a DummyCache.
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class UserRoleMemoTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('heir', password='pw')
+        self.user.profile.role = 'HEIR'
+        self.user.profile.save()
+
+    def test_role_is_memoized(self):
+        self.assertEqual(get_user_role(self.user), 'HEIR')
+        with self.assertNumQueries(0):
+            self.assertEqual(get_user_role(self.user), 'HEIR')
+
+    def test_profile_save_clears_the_memoized_role(self):
+        self.assertEqual(get_user_role(self.user), 'HEIR')
+        self.user.profile.role = 'OBSERVER'
+        self.user.profile.save()
+        self.assertEqual(get_user_role(self.user), 'OBSERVER')
+
+    def test_granting_a_mantle_clears_the_memoized_role(self):
+        self.assertEqual(get_user_role(self.user), 'HEIR')
+        Mantle.objects.create(user=self.user, end_time=timezone.now() + timedelta(hours=1))
+        self.assertEqual(get_user_role(self.user), 'PROTECTOR')
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class LeadershipUserIdsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.protector = User.objects.create_user('protector', password='pw')
+        self.protector.profile.role = 'PROTECTOR'
+        self.protector.profile.save()
+        self.agent = User.objects.create_user('agent', password='pw')
+
+    def test_ids_are_cached(self):
+        self.assertEqual(leadership_user_ids(), [self.protector.id])
+        with self.assertNumQueries(0):
+            self.assertEqual(leadership_user_ids(), [self.protector.id])
+
+    def test_promotion_and_demotion_clear_the_cache(self):
+        leadership_user_ids()
+        self.agent.profile.role = 'HEIR'
+        self.agent.profile.save()
+        self.assertCountEqual(leadership_user_ids(), [self.protector.id, self.agent.id])
+        self.protector.profile.role = 'OBSERVER'
+        self.protector.profile.save()
+        self.assertEqual(leadership_user_ids(), [self.agent.id])
+
+    def test_unrelated_saves_keep_the_cache(self):
+        leadership_user_ids()
+        self.agent.last_login = timezone.now()
+        self.agent.save()
+        # Observer -> HQ moves between two non-leadership roles.
+        self.agent.profile.role = 'HQ'
+        self.agent.profile.save()
+        with self.assertNumQueries(0):
+            leadership_user_ids()
+
+    def test_deleting_a_profile_clears_the_cache(self):
+        leadership_user_ids()
+        UserProfile.objects.get(user=self.protector).delete()
+        self.assertEqual(leadership_user_ids(), [])
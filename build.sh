@@ -7,4 +7,5 @@ python3 -m pip install -r backend/requirements.txt
 python3 backend/manage.py migrate --noinput
 
 # 3. Run collectstatic
-python3 backend/manage.py collectstatic --noinput
\ No newline at end of file
+# (source files never belong in static/, so skip any that slip in)
+python3 backend/manage.py collectstatic --noinput --ignore "*.py"
\ No newline at end of file